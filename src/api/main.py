@@ -1,5 +1,6 @@
 """FastAPI application entry point."""
 
+import threading
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional
@@ -9,7 +10,13 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from src.api.models import HealthResponse
 from src.api.routes import router
-from src.vectorstore import ChromaStore
+from src.llm import LLMProvider, LLMSettings, warm_tokenizers
+from src.vectorstore import (
+    ChromaStore,
+    EmbeddingProvider,
+    EmbeddingSettings,
+    preload_embeddings,
+)
 
 
 # Global state
@@ -31,8 +38,25 @@ async def lifespan(app: FastAPI):
         collection_name="documents",
         persist_directory=persist_dir,
     )
+    # Load tokenizer tables and any local embedding model in the
+    # background, off the first query's path. Only OpenAI models use
+    # tiktoken, so encoders are loaded only for those in use
+    llm_settings = LLMSettings()
+    embedding_settings = EmbeddingSettings()
+    openai_models = []
+    if llm_settings.llm_provider == LLMProvider.OPENAI:
+        openai_models.append(llm_settings.openai_model)
+    if embedding_settings.embedding_provider == EmbeddingProvider.OPENAI:
+        openai_models.append(embedding_settings.embedding_model)
+    if openai_models:
+        threading.Thread(
+            target=warm_tokenizers, args=tuple(openai_models), daemon=True
+        ).start()
+    preload_embeddings(embedding_settings)
     yield
     # Shutdown: Cleanup if needed
+    if app_state.vector_store is not None:
+        app_state.vector_store.flush()
     app_state.vector_store = None
 
 
@@ -1,5 +1,6 @@
 """API route definitions."""
 
+import asyncio
 from pathlib import Path
 from typing import List
 
@@ -84,13 +85,14 @@ async def ingest_documents(
                 # Clean up temp file
                 temp_path.unlink(missing_ok=True)
         
-        # Chunk all documents
+        # Chunk all documents (CPU-bound, and may start worker processes
+        # for large uploads), off the event loop
         config = ChunkingConfig(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-        chunks = chunk_documents(all_documents, config)
+        chunks = await asyncio.to_thread(chunk_documents, all_documents, config)
         
         # Add to vector store
         vector_store = get_vector_store()
-        vector_store.add_documents(chunks)
+        await vector_store.aadd_documents(chunks)
         
         return IngestResponse(
             message="Documents ingested successfully",
@@ -6,6 +6,24 @@ from typing import List, Optional
 
 from langchain_core.documents import Document
 
+# Common words skipped when extracting significant answer terms
+_STOP_WORDS: frozenset[str] = frozenset({
+    "the", "a", "an", "is", "are", "was", "were", "be", "been",
+    "being", "have", "has", "had", "do", "does", "did", "will",
+    "would", "could", "should", "may", "might", "must", "shall",
+    "can", "need", "dare", "ought", "used", "to", "of", "in",
+    "for", "on", "with", "at", "by", "from", "as", "into", "through",
+    "during", "before", "after", "above", "below", "between", "under",
+    "again", "further", "then", "once", "here", "there", "when", "where",
+    "why", "how", "all", "each", "few", "more", "most", "other", "some",
+    "such", "no", "nor", "not", "only", "own", "same", "so", "than",
+    "too", "very", "just", "and", "but", "if", "or", "because", "until",
+    "while", "this", "that", "these", "those", "i", "it", "its",
+})
+
+# Punctuation removed from answer text before tokenizing
+_PUNCT_TABLE = str.maketrans("", "", ".,!?")
+
 
 @dataclass
 class EvaluationResult:
@@ -63,24 +81,75 @@ def calculate_relevance_score(
     if not retrieved_docs:
         return 0.0
     
+    return _relevance_from_lowered(
+        _combine_lowered([doc.page_content for doc in retrieved_docs]),
+        expected_keywords,
+    )
+
+
+def _combine_lowered(texts: List[str]) -> str:
+    """Join texts into one lowercased string shared by both scorers."""
+    return " ".join(texts).lower()
+
+
+def _relevance_from_lowered(
+    combined_content: str,
+    expected_keywords: Optional[List[str]] = None,
+) -> float:
+    """Relevance score over pre-lowercased, concatenated document text."""
     if not expected_keywords:
         # If no keywords provided, assume docs are relevant if retrieved
         return 1.0
     
     # Check how many keywords appear in any retrieved document
-    combined_content = " ".join(doc.page_content.lower() for doc in retrieved_docs)
-    matches = sum(1 for kw in expected_keywords if kw.lower() in combined_content)
+    lowered_keywords = [kw.lower() for kw in expected_keywords]
+    found = _find_keywords(set(lowered_keywords), combined_content)
+    matches = sum(1 for kw in lowered_keywords if kw in found)
     
     return matches / len(expected_keywords)
 
 
+def _find_keywords(keywords: set, text: str) -> set:
+    """Return the subset of keywords occurring as substrings of text.
+    
+    Uses a pyahocorasick automaton if available (one linear scan over the
+    text for all keywords), falls back to one substring check per keyword.
+    
+    Args:
+        keywords: Lowercased keywords to look for.
+        text: Lowercased text to scan.
+        
+    Returns:
+        Set of keywords found in text.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return {kw for kw in keywords if kw in text}
+    
+    # Empty strings are trivially contained but cannot be added to an automaton
+    found = {kw for kw in keywords if not kw}
+    automaton = ahocorasick.Automaton()
+    for kw in keywords - found:
+        automaton.add_word(kw, kw)
+    
+    if len(automaton) == 0:
+        return found
+    
+    automaton.make_automaton()
+    for _, kw in automaton.iter(text):
+        found.add(kw)
+    return found
+
+
 def calculate_faithfulness_score(
     answer: str,
     retrieved_docs: List[Document],
 ) -> float:
     """Calculate faithfulness score based on source coverage.
     
-    Simple heuristic: checks if answer terms appear in sources.
+    Simple heuristic: checks if answer terms appear as whole words in
+    sources (so "cat" does not match "category").
     For production, use LLM-as-judge or NLI model.
     
     Args:
@@ -90,31 +159,31 @@ def calculate_faithfulness_score(
     Returns:
         Score between 0.0 and 1.0.
     """
-    if not answer or not retrieved_docs:
+    if not retrieved_docs:
+        return 0.0
+    
+    return _faithfulness_from_lowered(
+        answer, _combine_lowered([doc.page_content for doc in retrieved_docs])
+    )
+
+
+def _faithfulness_from_lowered(answer: str, combined_sources: str) -> float:
+    """Faithfulness score over pre-lowercased, concatenated source text."""
+    if not answer:
         return 0.0
     
     # Get significant words from answer (skip common words)
-    stop_words = {"the", "a", "an", "is", "are", "was", "were", "be", "been", 
-                  "being", "have", "has", "had", "do", "does", "did", "will",
-                  "would", "could", "should", "may", "might", "must", "shall",
-                  "can", "need", "dare", "ought", "used", "to", "of", "in",
-                  "for", "on", "with", "at", "by", "from", "as", "into", "through",
-                  "during", "before", "after", "above", "below", "between", "under",
-                  "again", "further", "then", "once", "here", "there", "when", "where",
-                  "why", "how", "all", "each", "few", "more", "most", "other", "some",
-                  "such", "no", "nor", "not", "only", "own", "same", "so", "than",
-                  "too", "very", "just", "and", "but", "if", "or", "because", "until",
-                  "while", "this", "that", "these", "those", "i", "it", "its"}
-    
-    answer_words = set(word.lower().strip(".,!?") for word in answer.split() 
-                       if len(word) > 2 and word.lower() not in stop_words)
+    lowered = answer.lower().translate(_PUNCT_TABLE)
+    answer_words = {w for w in lowered.split() if len(w) > 2 and w not in _STOP_WORDS}
     
     if not answer_words:
         return 1.0  # No significant words to check
     
-    # Check how many answer words appear in sources
-    combined_sources = " ".join(doc.page_content.lower() for doc in retrieved_docs)
-    matches = sum(1 for word in answer_words if word in combined_sources)
+    # Check how many answer words appear as words in sources. Probing the
+    # small answer set with each source token avoids hashing the sources
+    # into a set of their own.
+    source_tokens = combined_sources.translate(_PUNCT_TABLE).split()
+    matches = len(answer_words.intersection(source_tokens))
     
     return matches / len(answer_words)
 
@@ -140,14 +209,16 @@ def evaluate_response(
     Returns:
         EvaluationResult with all metrics.
     """
-    # Convert sources to Documents for scoring
-    docs = [
-        Document(page_content=s.get("content", ""), metadata=s.get("metadata", {}))
-        for s in sources
-    ]
-    
-    relevance = calculate_relevance_score(question, docs, expected_keywords)
-    faithfulness = calculate_faithfulness_score(answer, docs)
+    # Score the raw source contents directly, no Document round-trip,
+    # lowercasing them once for both metrics
+    texts = [s.get("content", "") for s in sources]
+    
+    if texts:
+        combined = _combine_lowered(texts)
+        relevance = _relevance_from_lowered(combined, expected_keywords)
+        faithfulness = _faithfulness_from_lowered(answer, combined)
+    else:
+        relevance = faithfulness = 0.0
     
     return EvaluationResult(
         question=question,
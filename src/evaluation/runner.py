@@ -2,67 +2,102 @@
 
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from src.evaluation.metrics import EvaluationResult, evaluate_response
 from src.evaluation.tracker import ExperimentTracker
 from src.retrieval import RAGChain
 from src.vectorstore import ChromaStore
 
+# Upper bound on concurrent RAG queries during evaluation
+MAX_CONCURRENT_QUERIES = 16
+
 
 def load_test_questions(file_path: Path) -> List[dict]:
     """Load test questions from JSON file.
     
+    Parsed with orjson if available. The file is read as bytes, so its
+    encoding is detected from the content rather than the locale.
+    
     Args:
         file_path: Path to test questions JSON.
         
     Returns:
         List of question dictionaries.
     """
-    with open(file_path) as f:
-        data = json.load(f)
+    raw = Path(file_path).read_bytes()
+    try:
+        import orjson
+    except ImportError:
+        data = json.loads(raw)
+    else:
+        data = orjson.loads(raw)
     return data.get("questions", [])
 
 
+def _timed_invoke(chain: RAGChain, question: str) -> Tuple[dict, float]:
+    """Run a single query and measure its latency.
+    
+    Args:
+        chain: RAG chain to query.
+        question: Question to ask.
+        
+    Returns:
+        Tuple of (chain response, latency in seconds).
+    """
+    start = time.perf_counter()
+    response = chain.invoke(question)
+    return response, time.perf_counter() - start
+
+
 def run_evaluation(
     vector_store: ChromaStore,
     questions: List[dict],
     tracker: Optional[ExperimentTracker] = None,
     k: int = 4,
+    max_workers: int = MAX_CONCURRENT_QUERIES,
 ) -> List[EvaluationResult]:
     """Run evaluation on a set of questions.
     
+    Queries are network-bound, so they run concurrently on a thread pool;
+    scoring and logging happen afterwards in question order. The store is
+    warmed (opened, and any quantized index built) before the threads
+    start, rather than by whichever query reaches it first.
+    
     Args:
         vector_store: Initialized vector store with documents.
         questions: List of test questions.
         tracker: Optional MLflow tracker for logging.
         k: Number of documents to retrieve.
+        max_workers: Maximum number of concurrent queries.
         
     Returns:
         List of EvaluationResult objects.
     """
+    if not questions:
+        return []
+    
+    vector_store.warm()
     chain = RAGChain(vector_store=vector_store, k=k)
-    results = []
     
-    for i, q in enumerate(questions):
-        question = q["question"]
-        expected_keywords = q.get("expected_keywords", [])
-        expected_answer = q.get("expected_answer")
-        
-        # Time the query
-        start = time.perf_counter()
-        response = chain.invoke(question)
-        latency = time.perf_counter() - start
-        
+    # Time each query inside its worker so latency excludes queueing
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(questions))) as executor:
+        responses = list(
+            executor.map(lambda q: _timed_invoke(chain, q["question"]), questions)
+        )
+    
+    results = []
+    for i, (q, (response, latency)) in enumerate(zip(questions, responses)):
         # Evaluate
         result = evaluate_response(
-            question=question,
+            question=q["question"],
             answer=response["answer"],
             sources=response["sources"],
             latency=latency,
-            expected_answer=expected_answer,
-            expected_keywords=expected_keywords,
+            expected_answer=q.get("expected_answer"),
+            expected_keywords=q.get("expected_keywords", []),
         )
         
         results.append(result)
@@ -1,19 +1,49 @@
 """MLflow experiment tracking for RAG evaluation."""
 
+import json
 import os
+import tempfile
+import time
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import mlflow
+import numpy as np
+from mlflow.entities import Metric
 from mlflow.tracking import MlflowClient
 
 from src.evaluation.metrics import EvaluationResult
 
+# MLflow rejects log_batch requests with more metrics than this
+MAX_METRICS_PER_BATCH = 1000
+
+
+def _dumps_json(data: Dict) -> bytes:
+    """Serialize data as indented JSON, using orjson if available.
+    
+    Args:
+        data: JSON-serializable dictionary (NumPy values allowed with orjson).
+        
+    Returns:
+        UTF-8 encoded JSON document.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(data, indent=2).encode("utf-8")
+    
+    options = (
+        orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    )
+    return orjson.dumps(data, option=options)
+
 
 class ExperimentTracker:
     """MLflow experiment tracker for RAG evaluation.
     
     Tracks metrics, parameters, and artifacts for RAG experiments.
+    Per-query metrics are buffered and written in bulk: a full batch as
+    soon as one accumulates, the remainder when the run ends.
     """
     
     def __init__(
@@ -48,6 +78,7 @@ class ExperimentTracker:
         
         mlflow.set_experiment(experiment_name)
         self._active_run = None
+        self._buffered_metrics: List[Metric] = []
     
     def start_run(self, run_name: Optional[str] = None, tags: Optional[Dict] = None) -> str:
         """Start a new MLflow run.
@@ -63,11 +94,24 @@ class ExperimentTracker:
         return self._active_run.info.run_id
     
     def end_run(self):
-        """End the current MLflow run."""
+        """Flush buffered metrics and end the current MLflow run."""
         if self._active_run:
+            self.flush_metrics()
             mlflow.end_run()
             self._active_run = None
     
+    def flush_metrics(self):
+        """Write buffered per-query metrics to the active run in bulk."""
+        if not self._buffered_metrics or not self._active_run:
+            return
+        
+        metrics, self._buffered_metrics = self._buffered_metrics, []
+        for i in range(0, len(metrics), MAX_METRICS_PER_BATCH):
+            self.client.log_batch(
+                run_id=self.run_id,
+                metrics=metrics[i:i + MAX_METRICS_PER_BATCH],
+            )
+    
     def log_params(self, params: Dict):
         """Log parameters for the current run.
         
@@ -107,6 +151,12 @@ class ExperimentTracker:
     def log_evaluation(self, result: EvaluationResult, step: Optional[int] = None):
         """Log evaluation metrics for a single query.
         
+        Within a run started by start_run(), metrics are buffered in
+        memory. Each time MAX_METRICS_PER_BATCH accumulate they are written
+        in one request; the rest are written by flush_metrics() (called
+        from end_run()). Without one, they are logged immediately, to the
+        run mlflow starts or already has active.
+        
         Args:
             result: EvaluationResult containing metrics.
             step: Optional step number for the metric.
@@ -122,7 +172,21 @@ class ExperimentTracker:
         if result.faithfulness_score is not None:
             metrics["faithfulness_score"] = result.faithfulness_score
         
-        mlflow.log_metrics(metrics, step=step)
+        if not self._active_run:
+            mlflow.log_metrics(metrics, step=step)
+            return
+        
+        timestamp = int(time.time() * 1000)
+        self._buffered_metrics.extend(
+            Metric(key=key, value=float(value), timestamp=timestamp, step=step or 0)
+            for key, value in metrics.items()
+        )
+        
+        # Bound the buffer on long runs; full batches cost no extra requests
+        if len(self._buffered_metrics) >= MAX_METRICS_PER_BATCH:
+            batch = self._buffered_metrics[:MAX_METRICS_PER_BATCH]
+            del self._buffered_metrics[:MAX_METRICS_PER_BATCH]
+            self.client.log_batch(run_id=self.run_id, metrics=batch)
     
     def log_batch_results(self, results: List[EvaluationResult]):
         """Log aggregated metrics for a batch of evaluations.
@@ -133,10 +197,20 @@ class ExperimentTracker:
         if not results:
             return
         
-        # Calculate aggregates
-        avg_latency = sum(r.latency_seconds for r in results) / len(results)
-        avg_relevance = sum(r.relevance_score or 0 for r in results) / len(results)
-        avg_faithfulness = sum(r.faithfulness_score or 0 for r in results) / len(results)
+        # Calculate aggregates in one pass (missing scores count as 0)
+        scores = np.fromiter(
+            (
+                (
+                    r.latency_seconds,
+                    r.relevance_score or 0.0,
+                    r.faithfulness_score or 0.0,
+                )
+                for r in results
+            ),
+            dtype=np.dtype((np.float64, 3)),
+            count=len(results),
+        )
+        avg_latency, avg_relevance, avg_faithfulness = scores.mean(axis=0).tolist()
         
         mlflow.log_metrics({
             "avg_latency_seconds": avg_latency,
@@ -161,11 +235,8 @@ class ExperimentTracker:
             data: Dictionary to log.
             filename: Name for the artifact file.
         """
-        import json
-        import tempfile
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(data, f, indent=2)
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.json', delete=False) as f:
+            f.write(_dumps_json(data))
             temp_path = f.name
         
         try:
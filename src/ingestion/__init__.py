@@ -1,8 +1,14 @@
 """Document ingestion module for loading and chunking documents."""
 
-from src.ingestion.chunking import ChunkingConfig, chunk_documents, chunk_text
+from src.ingestion.chunking import (
+    ChunkingConfig,
+    chunk_documents,
+    chunk_text,
+    iter_chunks,
+)
 from src.ingestion.loaders import (
     DocumentLoaderError,
+    lazy_load_pdf,
     load_directory,
     load_document,
     load_markdown,
@@ -13,6 +19,7 @@ from src.ingestion.loaders import (
 __all__ = [
     # Loaders
     "load_pdf",
+    "lazy_load_pdf",
     "load_markdown",
     "load_text",
     "load_document",
@@ -22,4 +29,5 @@ __all__ = [
     "ChunkingConfig",
     "chunk_documents",
     "chunk_text",
+    "iter_chunks",
 ]
@@ -1,10 +1,23 @@
 """Text chunking strategies for document processing."""
 
-from typing import List, Optional
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, cast
 
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+# Below this many characters in total, process start-up costs more than
+# it saves. Counted in text rather than documents: every PDF page is a
+# Document, and splitting a few small ones takes about a millisecond
+PARALLEL_MIN_CHARS = 4_000_000
+
+# Joins duplicate-chunk sources in "aliases" metadata; a string, since
+# Chroma releases before 1.0 reject list-valued metadata
+ALIAS_SEPARATOR = "\n"
+
 
 class ChunkingConfig:
     """Configuration for text chunking.
@@ -33,11 +46,154 @@ class ChunkingConfig:
         self.separators = separators or ["\n\n", "\n", ". ", " ", ""]
 
 
-def create_text_splitter(config: Optional[ChunkingConfig] = None) -> RecursiveCharacterTextSplitter:
+class FastRecursiveSplitter(RecursiveCharacterTextSplitter):
+    """RecursiveCharacterTextSplitter with a faster path for literal separators.
+    
+    Produces the same chunks as the base class, but locates and splits on
+    literal separators with C-level str.find/str.split instead of building
+    and running a regex at every recursion level, keeps the overlap
+    window in a deque instead of re-slicing a list for every dropped piece,
+    cuts the character-level fallback by slicing fixed windows, and
+    returns text shorter than chunk_size without splitting it at all.
+    Regex separators are delegated to the base implementation.
+    """
+    
+    def _split_text(self, text: str, separators: List[str]) -> List[str]:
+        if self._is_separator_regex:
+            return super()._split_text(text, separators)
+        
+        # Text shorter than a chunk comes back whole: with separators kept,
+        # its pieces would just be merged back into the original
+        if (
+            self._keep_separator
+            and self._length_function is len
+            and len(text) < self._chunk_size
+        ):
+            chunk = text.strip() if self._strip_whitespace else text
+            return [chunk] if chunk else []
+        
+        # First separator present in the text wins; "" always matches
+        separator = separators[-1]
+        new_separators: List[str] = []
+        for i, sep in enumerate(separators):
+            if not sep:
+                separator = sep
+                break
+            if sep in text:
+                separator = sep
+                new_separators = separators[i + 1:]
+                break
+        
+        if not separator and self._length_function is len and self._chunk_size > 1:
+            return self._split_chars(text)
+        
+        splits = self._split_on(text, separator)
+        
+        # Merge small pieces, recursing into pieces that are still too long
+        final_chunks: List[str] = []
+        good_splits: List[str] = []
+        merge_separator = "" if self._keep_separator else separator
+        for piece in splits:
+            if self._length_function(piece) < self._chunk_size:
+                good_splits.append(piece)
+                continue
+            if good_splits:
+                final_chunks.extend(self._merge_splits(good_splits, merge_separator))
+                good_splits = []
+            if not new_separators:
+                final_chunks.append(piece)
+            else:
+                final_chunks.extend(self._split_text(piece, new_separators))
+        if good_splits:
+            final_chunks.extend(self._merge_splits(good_splits, merge_separator))
+        return final_chunks
+    
+    def _split_on(self, text: str, separator: str) -> List[str]:
+        """Split on a literal separator, honouring keep_separator."""
+        if not separator:
+            return list(text)
+        
+        parts = text.split(separator)
+        if len(parts) == 1:
+            return parts if text else []
+        
+        # Build each list at its final size (separator count + 1) in one
+        # comprehension, then patch the one piece without a separator
+        if not self._keep_separator:
+            splits = parts
+        elif self._keep_separator == "end":
+            splits = [part + separator for part in parts]
+            splits[-1] = parts[-1]
+        else:
+            splits = [separator + part for part in parts]
+            splits[0] = parts[0]
+        return [piece for piece in splits if piece]
+    
+    def _split_chars(self, text: str) -> List[str]:
+        """Character-level fallback: cut fixed windows by slicing.
+        
+        Equivalent to merging list(text) one character at a time, where
+        each full window keeps its last min(overlap, chunk_size - 1)
+        characters, but without a Python-level step per character.
+        """
+        size = self._chunk_size
+        stride = size - min(self._chunk_overlap, size - 1)
+        
+        windows: List[str] = []
+        start = 0
+        while start + size < len(text):
+            windows.append(text[start:start + size])
+            start += stride
+        windows.append(text[start:])
+        
+        if not self._strip_whitespace:
+            return [w for w in windows if w]
+        return [w for w in (w.strip() for w in windows) if w]
+    
+    def _merge_splits(self, splits: Iterable[str], separator: str) -> List[str]:
+        separator_len = self._length_function(separator)
+        
+        docs: List[str] = []
+        current: Deque[str] = deque()
+        lengths: Deque[int] = deque()
+        total = 0
+        for piece in splits:
+            piece_len = self._length_function(piece)
+            if total + piece_len + (separator_len if current else 0) > self._chunk_size:
+                if current:
+                    doc = self._join_docs(list(current), separator)
+                    if doc is not None:
+                        docs.append(doc)
+                    # Drop from the front until only the overlap remains
+                    # and the next piece fits
+                    while total > self._chunk_overlap or (
+                        total + piece_len + (separator_len if current else 0)
+                        > self._chunk_size
+                        and total > 0
+                    ):
+                        total -= lengths.popleft() + (
+                            separator_len if len(current) > 1 else 0
+                        )
+                        current.popleft()
+            current.append(piece)
+            lengths.append(piece_len)
+            total += piece_len + (separator_len if len(current) > 1 else 0)
+        doc = self._join_docs(list(current), separator)
+        if doc is not None:
+            docs.append(doc)
+        return docs
+
+
+def create_text_splitter(
+    config: Optional[ChunkingConfig] = None,
+    fast: bool = True,
+) -> RecursiveCharacterTextSplitter:
     """Create a text splitter with the given configuration.
     
     Args:
         config: Chunking configuration. Uses defaults if None.
+        fast: Use FastRecursiveSplitter (same output, less Python overhead)
+            instead of the stock langchain splitter.
         
     Returns:
         Configured RecursiveCharacterTextSplitter.
@@ -45,7 +201,8 @@ def create_text_splitter(config: Optional[ChunkingConfig] = None) -> RecursiveCh
     if config is None:
         config = ChunkingConfig()
     
-    return RecursiveCharacterTextSplitter(
+    splitter_class = FastRecursiveSplitter if fast else RecursiveCharacterTextSplitter
+    return splitter_class(
         chunk_size=config.chunk_size,
         chunk_overlap=config.chunk_overlap,
         separators=config.separators,
@@ -57,18 +214,48 @@ def create_text_splitter(config: Optional[ChunkingConfig] = None) -> RecursiveCh
 def chunk_documents(
     documents: List[Document],
     config: Optional[ChunkingConfig] = None,
+    max_workers: Optional[int] = None,
+    dedup: bool = False,
 ) -> List[Document]:
     """Split documents into smaller chunks.
     
+    Splitting is pure CPU work and independent per document, so larger
+    batches are sharded across worker processes.
+    
     Args:
         documents: List of documents to chunk.
         config: Chunking configuration. Uses defaults if None.
+        max_workers: Number of worker processes. Defaults to CPU count.
+            Batches with fewer than PARALLEL_MIN_CHARS characters of text,
+            or max_workers <= 1, are split in-process.
+        dedup: Collapse chunks with identical content (see dedup_chunks),
+            so each is embedded once. Off by default: a collapsed chunk
+            keeps only its first source, so filtering or deleting by the
+            other sources no longer finds it.
         
     Returns:
         List of chunked documents with preserved metadata.
     """
     splitter = create_text_splitter(config)
-    chunked = splitter.split_documents(documents)
+    
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    
+    total_chars = sum(len(doc.page_content) for doc in documents)
+    if total_chars < PARALLEL_MIN_CHARS or len(documents) < 2 or max_workers <= 1:
+        chunked = splitter.split_documents(documents)
+    else:
+        batch_size = max(1, len(documents) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            chunks_per_doc = pool.map(
+                splitter.split_documents,
+                [[doc] for doc in documents],
+                chunksize=batch_size,
+            )
+            chunked = [chunk for chunks in chunks_per_doc for chunk in chunks]
+    
+    if dedup:
+        chunked = dedup_chunks(chunked)
     
     # Add chunk index to metadata
     for i, doc in enumerate(chunked):
@@ -77,6 +264,67 @@ def chunk_documents(
     return chunked
 
 
+def dedup_chunks(chunks: List[Document]) -> List[Document]:
+    """Drop chunks whose content repeats an earlier chunk.
+    
+    Repeated headers, footers and boilerplate would otherwise each cost an
+    embedding call. The first occurrence is kept; sources of the dropped
+    duplicates are listed in its "aliases" metadata, joined by
+    ALIAS_SEPARATOR.
+    
+    Args:
+        chunks: Chunks in document order.
+        
+    Returns:
+        Chunks with duplicate content removed, order preserved.
+    """
+    seen: Dict[bytes, Document] = {}
+    unique = []
+    for chunk in chunks:
+        key = hashlib.blake2b(chunk.page_content.encode(), digest_size=16).digest()
+        representative = seen.get(key)
+        if representative is None:
+            seen[key] = chunk
+            unique.append(chunk)
+            continue
+        
+        # Created on first foreign source
+        source = chunk.metadata.get("source")
+        if source and source != representative.metadata.get("source"):
+            aliases = representative.metadata.get("aliases")
+            if aliases is None:
+                representative.metadata["aliases"] = source
+            elif source not in aliases.split(ALIAS_SEPARATOR):
+                representative.metadata["aliases"] = aliases + ALIAS_SEPARATOR + source
+    
+    return unique
+
+
+def iter_chunks(
+    documents: Iterable[Document],
+    config: Optional[ChunkingConfig] = None,
+) -> Iterator[Document]:
+    """Lazily split a stream of documents into chunks.
+    
+    Unlike chunk_documents, documents are consumed one at a time, so a
+    generator such as lazy_load_pdf is never fully materialized. Chunks
+    are not deduplicated: a chunk's aliases are only known once the whole
+    stream has been seen, after it was yielded.
+    
+    Args:
+        documents: Iterable of documents to chunk.
+        config: Chunking configuration. Uses defaults if None.
+        
+    Yields:
+        Chunked documents with preserved metadata and a running chunk_index.
+    """
+    splitter = create_text_splitter(config)
+    chunks = (chunk for doc in documents for chunk in splitter.split_documents([doc]))
+    for chunk_index, chunk in enumerate(chunks):
+        chunk.metadata["chunk_index"] = chunk_index
+        yield chunk
+
+
 def chunk_text(
     text: str,
     config: Optional[ChunkingConfig] = None,
@@ -96,10 +344,12 @@ def chunk_text(
     texts = splitter.split_text(text)
     
     base_metadata = metadata or {}
-    documents = []
     
+    # Sized from texts up front rather than grown by append
+    documents: List[Optional[Document]] = [None] * len(texts)
     for i, chunk_text in enumerate(texts):
         doc_metadata = {**base_metadata, "chunk_index": i}
-        documents.append(Document(page_content=chunk_text, metadata=doc_metadata))
+        documents[i] = Document(page_content=chunk_text, metadata=doc_metadata)
     
-    return documents
+    # Every slot was filled above
+    return cast(List[Document], documents)
@@ -1,7 +1,11 @@
 """Document loaders for PDF, Markdown, and TXT files."""
 
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 from langchain_community.document_loaders import (
     PyPDFLoader,
@@ -9,6 +13,17 @@ from langchain_community.document_loaders import (
 )
 from langchain_core.documents import Document
 
+from src.ingestion.io_uring_loader import batch_read_texts
+
+logger = logging.getLogger(__name__)
+
+# Plain-text suffixes and the file_type metadata their loaders assign
+_TEXT_FILE_TYPES = {".txt": "text", ".md": "markdown", ".markdown": "markdown"}
+
+# Below this many bytes in total, starting worker processes (each
+# re-imports langchain and pypdf) costs more than parsing in-process
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
 
 class DocumentLoaderError(Exception):
     """Raised when document loading fails."""
@@ -27,19 +42,35 @@ def load_pdf(file_path: Path) -> List[Document]:
     Raises:
         DocumentLoaderError: If file doesn't exist or loading fails.
     """
+    return list(lazy_load_pdf(file_path))
+
+
+def lazy_load_pdf(file_path: Path) -> Iterator[Document]:
+    """Stream a PDF file page by page.
+    
+    Each page is parsed only when requested, so feeding this into
+    iter_chunks keeps one page in memory instead of the whole document.
+    
+    Args:
+        file_path: Path to PDF file.
+        
+    Yields:
+        One Document per page, with the same metadata as load_pdf.
+        
+    Raises:
+        DocumentLoaderError: If file doesn't exist or loading fails
+            (raised on iteration).
+    """
     if not file_path.exists():
         raise DocumentLoaderError(f"File not found: {file_path}")
     
     try:
         loader = PyPDFLoader(str(file_path))
-        documents = loader.load()
-        
-        # Ensure consistent metadata
-        for doc in documents:
+        for doc in loader.lazy_load():
+            # Ensure consistent metadata
             doc.metadata["source"] = str(file_path)
             doc.metadata["file_type"] = "pdf"
-        
-        return documents
+            yield doc
     except Exception as e:
         raise DocumentLoaderError(f"Failed to load PDF {file_path}: {e}")
 
@@ -133,16 +164,88 @@ def load_document(file_path: Path) -> List[Document]:
     return loaders[suffix](file_path)
 
 
+def _default_max_workers() -> int:
+    """Worker count for directory loading.
+    
+    Reads LOAD_DOCUMENTS_NUMBER_OF_THREADS, defaulting to one less than
+    the number of CPUs (at least 1).
+    """
+    default = max(1, (os.cpu_count() or 2) - 1)
+    return int(os.environ.get("LOAD_DOCUMENTS_NUMBER_OF_THREADS", default))
+
+
+def _load_document_safe(file_path: Path) -> Tuple[List[Document], Optional[str]]:
+    """Load a document, returning the error message instead of raising.
+    
+    Keeps per-file loader failures from aborting a pooled directory load.
+    
+    Args:
+        file_path: Path to document file.
+        
+    Returns:
+        Tuple of (documents, error message or None).
+    """
+    try:
+        return load_document(file_path), None
+    except DocumentLoaderError as e:
+        return [], str(e)
+
+
+def _load_text_files(
+    file_paths: List[Path],
+) -> List[Tuple[List[Document], Optional[str]]]:
+    """Load plain-text files with one batched read.
+    
+    Produces the same documents as load_text/load_markdown. If the batch
+    read fails, files are loaded one by one so errors are reported per file.
+    
+    Args:
+        file_paths: Paths with suffixes in _TEXT_FILE_TYPES.
+        
+    Returns:
+        List of (documents, error message or None), one per path.
+    """
+    try:
+        texts = batch_read_texts(file_paths)
+    except (OSError, UnicodeDecodeError):
+        return [_load_document_safe(file_path) for file_path in file_paths]
+    
+    return [
+        (
+            [
+                Document(
+                    page_content=text,
+                    metadata={
+                        "source": str(file_path),
+                        "file_type": _TEXT_FILE_TYPES[file_path.suffix.lower()],
+                    },
+                )
+            ],
+            None,
+        )
+        for file_path, text in zip(file_paths, texts)
+    ]
+
+
 def load_directory(
     directory: Path,
     extensions: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
 ) -> List[Document]:
     """Load all supported documents from a directory.
     
+    Files are parsed in parallel worker processes, since PDF parsing is
+    CPU-bound and independent per file, once they total PARALLEL_MIN_BYTES
+    or more; smaller directories are parsed in-process. On Linux, directories containing
+    only text/Markdown files are instead read in one io_uring batch.
+    
     Args:
         directory: Path to directory containing documents.
         extensions: Optional list of extensions to filter (e.g., [".pdf", ".md"]).
                    If None, loads all supported types.
+        max_workers: Number of worker processes. Defaults to the
+                   LOAD_DOCUMENTS_NUMBER_OF_THREADS environment variable,
+                   or CPU count - 1. Values <= 1 load serially.
         
     Returns:
         List of all Document objects from directory.
@@ -158,19 +261,43 @@ def load_directory(
     
     supported = {".pdf", ".md", ".markdown", ".txt"}
     if extensions:
-        extensions = [e.lower() if e.startswith(".") else f".{e.lower()}" for e in extensions]
-        extensions = [e for e in extensions if e in supported]
+        ext_set = {
+            e.lower() if e.startswith(".") else f".{e.lower()}" for e in extensions
+        }
+        ext_set &= supported
+    else:
+        ext_set = supported
+    
+    # One directory pass, matching suffixes case-insensitively
+    with os.scandir(directory) as entries:
+        files = sorted(
+            (Path(entry.path), entry.stat().st_size)
+            for entry in entries
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in ext_set
+        )
+    file_paths = [file_path for file_path, _ in files]
+    total_bytes = sum(size for _, size in files)
+    
+    if max_workers is None:
+        max_workers = _default_max_workers()
+    max_workers = min(max_workers, len(file_paths))
+    
+    is_text_only = all(p.suffix.lower() in _TEXT_FILE_TYPES for p in file_paths)
+    
+    if sys.platform == "linux" and file_paths and is_text_only:
+        results = _load_text_files(file_paths)
+    elif max_workers > 1 and total_bytes >= PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_load_document_safe, file_paths))
     else:
-        extensions = list(supported)
+        results = [_load_document_safe(file_path) for file_path in file_paths]
     
     documents = []
-    for ext in extensions:
-        for file_path in directory.glob(f"*{ext}"):
-            try:
-                docs = load_document(file_path)
-                documents.extend(docs)
-            except DocumentLoaderError as e:
-                # Log warning but continue with other files
-                print(f"WARNING: {e}")
+    for docs, error in results:
+        if error is not None:
+            # Log warning but continue with other files
+            logger.warning("Skipping document: %s", error)
+            continue
+        documents.extend(docs)
     
     return documents
@@ -11,7 +11,9 @@ from src.llm.providers import (
     LLMProvider,
     LLMSettings,
     get_llm,
+    get_token_encoder,
     list_providers,
+    warm_tokenizers,
 )
 
 __all__ = [
@@ -20,6 +22,8 @@ __all__ = [
     "LLMSettings",
     "get_llm",
     "list_providers",
+    "get_token_encoder",
+    "warm_tokenizers",
     # Prompts
     "RAG_SYSTEM_PROMPT",
     "RAG_PROMPT",
@@ -49,13 +49,13 @@ def format_documents(documents: list) -> str:
     Returns:
         Formatted string with document contents and sources.
     """
-    formatted = []
-    for i, doc in enumerate(documents, 1):
-        source = doc.metadata.get("source", "Unknown")
-        content = doc.page_content.strip()
-        formatted.append(f"[Document {i}] (Source: {source})\n{content}")
-    
-    return "\n\n---\n\n".join(formatted)
+    # One f-string per document (a single allocation each) feeding one
+    # final join; a comprehension avoids the per-item append calls
+    return "\n\n---\n\n".join([
+        f"[Document {i}] (Source: {doc.metadata.get('source', 'Unknown')})\n"
+        f"{doc.page_content.strip()}"
+        for i, doc in enumerate(documents, 1)
+    ])
 
 # German system prompt for RAG
 RAG_SYSTEM_PROMPT_DE = """Du bist ein hilfreicher Assistent, der Fragen basierend auf dem bereitgestellten Kontext beantwortet.
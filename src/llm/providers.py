@@ -1,12 +1,10 @@
 """LLM provider implementations for multi-provider support."""
 
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 
-from langchain_anthropic import ChatAnthropic
-from langchain_community.chat_models import ChatOllama
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_openai import ChatOpenAI
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -45,6 +43,9 @@ class LLMSettings(BaseSettings):
 def get_llm(settings: Optional[LLMSettings] = None) -> BaseChatModel:
     """Get configured LLM instance.
     
+    Instances are cached per provider, model, credentials and generation
+    settings, so repeated calls with equivalent settings share one client.
+    
     Args:
         settings: LLM settings. Loads from environment if None.
         
@@ -61,34 +62,140 @@ def get_llm(settings: Optional[LLMSettings] = None) -> BaseChatModel:
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY not set in environment")
         
-        return ChatOpenAI(
+        return _build_llm(
+            settings.llm_provider,
+            settings.openai_model,
+            settings.temperature,
+            settings.max_tokens,
             api_key=settings.openai_api_key,
-            model=settings.openai_model,
-            temperature=settings.temperature,
-            max_tokens=settings.max_tokens,
         )
     
     elif settings.llm_provider == LLMProvider.ANTHROPIC:
         if not settings.anthropic_api_key:
             raise ValueError("ANTHROPIC_API_KEY not set in environment")
         
-        return ChatAnthropic(
+        return _build_llm(
+            settings.llm_provider,
+            settings.anthropic_model,
+            settings.temperature,
+            settings.max_tokens,
             api_key=settings.anthropic_api_key,
-            model=settings.anthropic_model,
-            temperature=settings.temperature,
-            max_tokens=settings.max_tokens,
         )
     
     elif settings.llm_provider == LLMProvider.OLLAMA:
-        return ChatOllama(
-            model=settings.ollama_model,
+        return _build_llm(
+            settings.llm_provider,
+            settings.ollama_model,
+            settings.temperature,
+            settings.max_tokens,
             base_url=settings.ollama_base_url,
-            temperature=settings.temperature,
         )
     
     raise ValueError(f"Unknown LLM provider: {settings.llm_provider}")
 
 
+@lru_cache(maxsize=8)
+def _build_llm(
+    provider: LLMProvider,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    api_key: str = "",
+    base_url: str = "",
+) -> BaseChatModel:
+    """Construct a chat model, cached by its identifying settings.
+    
+    Args:
+        provider: LLM provider.
+        model: Provider-specific model name.
+        temperature: Sampling temperature.
+        max_tokens: Maximum tokens to generate (not used by Ollama).
+        api_key: API key (OpenAI and Anthropic).
+        base_url: Server URL (Ollama only).
+        
+    Returns:
+        Chat model instance.
+    """
+    # Provider packages are imported on first use: together they take
+    # over a second to import, and a process only talks to one of them
+    if provider == LLMProvider.OPENAI:
+        from langchain_openai import ChatOpenAI
+        
+        return ChatOpenAI(
+            api_key=api_key,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+    
+    if provider == LLMProvider.ANTHROPIC:
+        from langchain_anthropic import ChatAnthropic
+        
+        return ChatAnthropic(
+            api_key=api_key,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+    
+    from langchain_community.chat_models import ChatOllama
+    
+    return ChatOllama(
+        model=model,
+        base_url=base_url,
+        temperature=temperature,
+    )
+
+
+def get_token_encoder(model: str) -> Optional[Any]:
+    """Get the shared tiktoken encoder for an OpenAI model.
+    
+    Loading BPE tables costs 100-300ms per process (and a download on a
+    cold cache), so encoders are built once and reused. Failures are not
+    cached, so a later call retries, e.g. once the network is back.
+    
+    Args:
+        model: OpenAI chat or embedding model name.
+        
+    Returns:
+        tiktoken Encoding, or None if tiktoken or the tables are unavailable.
+    """
+    try:
+        return _load_token_encoder(model)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=8)
+def _load_token_encoder(model: str) -> Any:
+    """Load the tiktoken encoder for a model, cached by model name.
+    
+    Raises:
+        ImportError: If tiktoken is not installed.
+        Exception: If the BPE tables cannot be loaded.
+    """
+    import tiktoken
+    
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Unknown model name: use the encoding of current OpenAI models
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def warm_tokenizers(*models: str) -> None:
+    """Preload tiktoken encoders so the first request doesn't load them.
+    
+    OpenAI clients look encodings up in tiktoken's process-wide registry,
+    which this populates.
+    
+    Args:
+        models: OpenAI model names whose encoders to load.
+    """
+    for model in models:
+        get_token_encoder(model)
+
+
 def list_providers() -> list[dict]:
     """List available LLM providers with their default models.
     
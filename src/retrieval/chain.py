@@ -1,17 +1,84 @@
 """RAG retrieval chain implementation."""
 
-from typing import AsyncIterator, Iterator, List, Optional
+from collections import deque
+from functools import cached_property
+from typing import AsyncIterator, Deque, Iterator, List, Optional, Tuple
 
 from langchain_core.documents import Document
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import Runnable
 
-from src.llm import format_documents, get_llm, RAG_CHAT_PROMPT, RAG_PROMPT
+from src.llm import (
+    format_documents,
+    get_llm,
+    RAG_CHAT_PROMPT,
+    RAG_SYSTEM_PROMPT,
+)
 from src.llm.providers import LLMSettings
 from src.vectorstore import ChromaStore
 
 
+# Characters of document content included in returned sources
+SOURCE_PREVIEW_CHARS = 200
+
+
+def _format_and_summarize(documents: List[Document]) -> Tuple[str, List[dict]]:
+    """Build prompt context and source previews.
+    
+    The context comes from format_documents, so the prompt matches the
+    tested formatter.
+    
+    Args:
+        documents: Retrieved documents.
+        
+    Returns:
+        Tuple of (context string from format_documents, list of source
+        dicts with truncated 'content' and 'metadata').
+    """
+    sources = []
+    for doc in documents:
+        # Slicing one past the limit tells us whether truncation happened
+        preview = doc.page_content[:SOURCE_PREVIEW_CHARS + 1]
+        if len(preview) > SOURCE_PREVIEW_CHARS:
+            preview = preview[:SOURCE_PREVIEW_CHARS] + "..."
+        sources.append({"content": preview, "metadata": doc.metadata})
+    
+    return format_documents(documents), sources
+
+
+def _rag_messages(context: str, query: str) -> List[BaseMessage]:
+    """Build the RAG_PROMPT messages directly, without template dispatch.
+    
+    Args:
+        context: Formatted document context.
+        query: User question.
+        
+    Returns:
+        System and human messages equal to RAG_PROMPT.format_messages().
+    """
+    return [
+        SystemMessage(content=RAG_SYSTEM_PROMPT.format(context=context)),
+        HumanMessage(content=query),
+    ]
+
+
+def _message_text(message: BaseMessage) -> str:
+    """Text of a (possibly streamed) LLM message, like StrOutputParser.
+    
+    Content is a plain string for most providers; some return a list of
+    content blocks, whose text parts are concatenated.
+    """
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block if isinstance(block, str) else block.get("text", "")
+        for block in content
+        if isinstance(block, str) or block.get("type") == "text"
+    )
+
+
 class RAGChain:
     """Retrieval-Augmented Generation chain.
     
@@ -23,6 +90,7 @@ class RAGChain:
         vector_store: ChromaStore,
         llm_settings: Optional[LLMSettings] = None,
         k: int = 4,
+        max_history_turns: int = 10,
     ):
         """Initialize RAG chain.
         
@@ -30,12 +98,14 @@ class RAGChain:
             vector_store: Vector store for document retrieval.
             llm_settings: LLM configuration. Loads from env if None.
             k: Number of documents to retrieve.
+            max_history_turns: Question/answer pairs kept in history; older
+                turns are dropped so the prompt stays bounded.
         """
         self.vector_store = vector_store
         self.llm_settings = llm_settings
         self.k = k
         self._llm = None
-        self._chat_history: List[BaseMessage] = []
+        self._chat_history: Deque[BaseMessage] = deque(maxlen=2 * max_history_turns)
     
     @property
     def llm(self):
@@ -44,6 +114,12 @@ class RAGChain:
             self._llm = get_llm(self.llm_settings)
         return self._llm
     
+    @cached_property
+    def _chat_chain(self) -> Runnable:
+        """RAG chain with conversation history, built once."""
+        chain: Runnable = RAG_CHAT_PROMPT | self.llm | StrOutputParser()
+        return chain
+    
     def retrieve(self, query: str) -> List[Document]:
         """Retrieve relevant documents for a query.
         
@@ -65,28 +141,20 @@ class RAGChain:
         Returns:
             Dict with 'answer' and 'sources' keys.
         """
-        # Retrieve documents
+        # Retrieve documents, formatting context and sources in one pass
         documents = self.retrieve(query)
-        context = format_documents(documents)
+        context, sources = _format_and_summarize(documents)
         
-        # Select prompt
+        # History needs the template's MessagesPlaceholder; otherwise call
+        # the LLM directly with prebuilt messages
         if use_history and self._chat_history:
-            prompt = RAG_CHAT_PROMPT
-            chain_input = {
+            answer = self._chat_chain.invoke({
                 "context": context,
                 "question": query,
-                "chat_history": self._chat_history,
-            }
+                "chat_history": list(self._chat_history),
+            })
         else:
-            prompt = RAG_PROMPT
-            chain_input = {
-                "context": context,
-                "question": query,
-            }
-        
-        # Build and run chain
-        chain = prompt | self.llm | StrOutputParser()
-        answer = chain.invoke(chain_input)
+            answer = _message_text(self.llm.invoke(_rag_messages(context, query)))
         
         # Update history
         if use_history:
@@ -95,13 +163,7 @@ class RAGChain:
         
         return {
             "answer": answer,
-            "sources": [
-                {
-                    "content": doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
-                    "metadata": doc.metadata,
-                }
-                for doc in documents
-            ],
+            "sources": sources,
         }
     
     def stream(self, query: str, use_history: bool = False) -> Iterator[str]:
@@ -118,28 +180,23 @@ class RAGChain:
         documents = self.retrieve(query)
         context = format_documents(documents)
         
-        # Select prompt
+        # Stream the chat chain with history, else the LLM directly
         if use_history and self._chat_history:
-            prompt = RAG_CHAT_PROMPT
-            chain_input = {
+            chunks = self._chat_chain.stream({
                 "context": context,
                 "question": query,
-                "chat_history": self._chat_history,
-            }
+                "chat_history": list(self._chat_history),
+            })
         else:
-            prompt = RAG_PROMPT
-            chain_input = {
-                "context": context,
-                "question": query,
-            }
-        
-        # Build and stream chain
-        chain = prompt | self.llm | StrOutputParser()
+            chunks = (
+                _message_text(chunk)
+                for chunk in self.llm.stream(_rag_messages(context, query))
+            )
         
         full_response = ""
-        for chunk in chain.stream(chain_input):
-            full_response += chunk
-            yield chunk
+        for text in chunks:
+            full_response += text
+            yield text
         
         # Update history after streaming completes
         if use_history:
@@ -160,28 +217,23 @@ class RAGChain:
         documents = self.retrieve(query)
         context = format_documents(documents)
         
-        # Select prompt
+        # Stream the chat chain with history, else the LLM directly
         if use_history and self._chat_history:
-            prompt = RAG_CHAT_PROMPT
-            chain_input = {
+            chunks = self._chat_chain.astream({
                 "context": context,
                 "question": query,
-                "chat_history": self._chat_history,
-            }
+                "chat_history": list(self._chat_history),
+            })
         else:
-            prompt = RAG_PROMPT
-            chain_input = {
-                "context": context,
-                "question": query,
-            }
-        
-        # Build and stream chain
-        chain = prompt | self.llm | StrOutputParser()
+            chunks = (
+                _message_text(chunk)
+                async for chunk in self.llm.astream(_rag_messages(context, query))
+            )
         
         full_response = ""
-        async for chunk in chain.astream(chain_input):
-            full_response += chunk
-            yield chunk
+        async for text in chunks:
+            full_response += text
+            yield text
         
         # Update history after streaming completes
         if use_history:
@@ -190,9 +242,9 @@ class RAGChain:
     
     def clear_history(self) -> None:
         """Clear conversation history."""
-        self._chat_history = []
+        self._chat_history.clear()
     
     @property
     def chat_history(self) -> List[BaseMessage]:
         """Get current conversation history."""
-        return self._chat_history.copy()
+        return list(self._chat_history)
@@ -3,20 +3,39 @@
 from src.vectorstore.embeddings import (
     EmbeddingProvider,
     EmbeddingSettings,
+    aembed_documents_batched,
+    aembed_texts,
+    embed_concurrency,
+    embed_documents_batched,
     embed_query,
     embed_texts,
     get_embeddings,
+    l2_normalize,
+    preload_embeddings,
+)
+from src.vectorstore.store import (
+    ChromaStore,
+    InMemoryStore,
+    QuantizedChromaStore,
+    VectorStoreError,
 )
-from src.vectorstore.store import ChromaStore, VectorStoreError
 
 __all__ = [
     # Embeddings
     "EmbeddingProvider",
     "EmbeddingSettings",
     "get_embeddings",
+    "preload_embeddings",
     "embed_texts",
+    "aembed_texts",
+    "embed_documents_batched",
+    "aembed_documents_batched",
+    "embed_concurrency",
     "embed_query",
+    "l2_normalize",
     # Store
     "ChromaStore",
+    "InMemoryStore",
+    "QuantizedChromaStore",
     "VectorStoreError",
 ]
@@ -1,12 +1,32 @@
 """Embedding providers for vector generation."""
 
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import List, Union
+from functools import lru_cache
+from typing import Callable, List, Optional, Protocol, Union, cast
 
+import numpy as np
 from langchain_core.embeddings import Embeddings
-from langchain_openai import OpenAIEmbeddings
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Default texts per embedding request and maximum concurrent requests
+# to a remote provider in embed_texts
+EMBED_BATCH_SIZE = 100
+EMBED_CONCURRENCY = 8
+
+# Texts per forward pass for local HuggingFace models
+HF_BATCH_SIZE = 64
+
+logger = logging.getLogger(__name__)
+
+# Cleared while preload_embeddings loads a model in the background;
+# get_embeddings waits on it rather than starting a second load
+_preload_done = threading.Event()
+_preload_done.set()
+
 
 class EmbeddingProvider(str, Enum):
     """Available embedding providers."""
@@ -23,11 +43,15 @@ class EmbeddingSettings(BaseSettings):
     embedding_provider: EmbeddingProvider = EmbeddingProvider.OPENAI
     embedding_model: str = "text-embedding-ada-002"
     huggingface_model: str = "intfloat/multilingual-e5-large"
+    embedding_batch_size: int = EMBED_BATCH_SIZE
 
 
-def get_embeddings(settings: EmbeddingSettings | None = None) -> Embeddings:
+def _get_embeddings(settings: EmbeddingSettings | None = None) -> Embeddings:
     """Get configured embedding model.
     
+    Instances are cached per provider, model and API key, so repeated calls
+    with equivalent settings reuse an already loaded model.
+    
     Args:
         settings: Embedding settings. Loads from environment if None.
         
@@ -41,38 +65,256 @@ def get_embeddings(settings: EmbeddingSettings | None = None) -> Embeddings:
         settings = EmbeddingSettings()
     
     if settings.embedding_provider == EmbeddingProvider.HUGGINGFACE:
-        from langchain_huggingface import HuggingFaceEmbeddings
-        
-        return HuggingFaceEmbeddings(
-            model_name=settings.huggingface_model,
-            model_kwargs={"device": "cpu"},
-            encode_kwargs={"normalize_embeddings": True},
-        )
+        _preload_done.wait()
+        return _load_embeddings(settings.embedding_provider, settings.huggingface_model)
     
     if settings.embedding_provider == EmbeddingProvider.OPENAI:
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY not set in environment")
         
-        return OpenAIEmbeddings(
-            api_key=settings.openai_api_key,
-            model=settings.embedding_model,
+        return _load_embeddings(
+            settings.embedding_provider,
+            settings.embedding_model,
+            settings.openai_api_key,
         )
     
     raise ValueError(f"Unknown embedding provider: {settings.embedding_provider}")
 
 
-def embed_texts(texts: List[str], settings: EmbeddingSettings | None = None) -> List[List[float]]:
+def preload_embeddings(
+    settings: EmbeddingSettings | None = None,
+) -> Optional[threading.Thread]:
+    """Start loading a HuggingFace embedding model in a background thread.
+    
+    Local models take seconds to load, which would otherwise be paid by
+    the first query. Calls to get_embeddings made during the load wait
+    for it to finish. OpenAI clients are constructed instantly, so
+    nothing is preloaded for them.
+    
+    Args:
+        settings: Embedding settings. Loads from environment if None.
+        
+    Returns:
+        The started daemon thread, or None if there is nothing to preload.
+    """
+    if settings is None:
+        settings = EmbeddingSettings()
+    
+    if settings.embedding_provider != EmbeddingProvider.HUGGINGFACE:
+        return None
+    
+    def load() -> None:
+        try:
+            _load_embeddings(settings.embedding_provider, settings.huggingface_model)
+        except Exception as e:
+            # Not cached, so the first get_embeddings call retries and raises
+            logger.warning("Embedding model preload failed: %s", e)
+        finally:
+            _preload_done.set()
+    
+    _preload_done.clear()
+    thread = threading.Thread(target=load, daemon=True)
+    thread.start()
+    return thread
+
+
+@lru_cache(maxsize=4)
+def _load_embeddings(
+    provider: EmbeddingProvider,
+    model_name: str,
+    api_key: str = "",
+) -> Embeddings:
+    """Construct an embedding model, cached by its identifying settings.
+    
+    Args:
+        provider: Embedding provider.
+        model_name: Provider-specific model name.
+        api_key: API key (OpenAI only).
+        
+    Returns:
+        Embedding model instance.
+    """
+    if provider == EmbeddingProvider.HUGGINGFACE:
+        from langchain_huggingface import HuggingFaceEmbeddings
+        
+        return HuggingFaceEmbeddings(
+            model_name=model_name,
+            model_kwargs=_hf_model_kwargs(),
+            encode_kwargs={"normalize_embeddings": True, "batch_size": HF_BATCH_SIZE},
+        )
+    
+    # Deferred like the HuggingFace import: pulls in openai and httpx
+    from langchain_openai import OpenAIEmbeddings
+    
+    return OpenAIEmbeddings(api_key=api_key, model=model_name)
+
+
+class _EmbeddingsFactory(Protocol):
+    """get_embeddings' signature, plus lru_cache's cache_clear."""
+    
+    cache_clear: Callable[[], None]
+    
+    def __call__(self, settings: EmbeddingSettings | None = None) -> Embeddings:
+        ...
+
+
+# Drop cached embedding models (e.g. between tests), like an lru_cache'd function
+get_embeddings = cast(_EmbeddingsFactory, _get_embeddings)
+get_embeddings.cache_clear = _load_embeddings.cache_clear
+
+
+def _hf_model_kwargs() -> dict:
+    """SentenceTransformer arguments for the fastest available device.
+    
+    On CUDA the model is loaded in float16, halving weight memory and
+    using tensor cores for the matmuls. Otherwise (or without torch)
+    it runs in float32 on the CPU.
+    """
+    try:
+        import torch
+    except ImportError:
+        return {"device": "cpu"}
+    
+    if not torch.cuda.is_available():
+        return {"device": "cpu"}
+    
+    return {"device": "cuda", "model_kwargs": {"torch_dtype": torch.float16}}
+
+
+def embed_texts(
+    texts: List[str],
+    settings: EmbeddingSettings | None = None,
+    batch_size: Optional[int] = None,
+) -> List[List[float]]:
     """Generate embeddings for a list of texts.
     
+    Lists longer than batch_size are embedded as concurrent batched
+    requests (see embed_documents_batched).
+    
     Args:
         texts: List of text strings to embed.
         settings: Embedding settings. Loads from environment if None.
+        batch_size: Texts per embedding request. Defaults to
+            settings.embedding_batch_size.
         
     Returns:
         List of embedding vectors.
     """
-    embeddings = get_embeddings(settings)
-    return embeddings.embed_documents(texts)
+    if settings is None:
+        settings = EmbeddingSettings()
+    if batch_size is None:
+        batch_size = settings.embedding_batch_size
+    
+    return embed_documents_batched(
+        get_embeddings(settings), texts, batch_size, embed_concurrency(settings)
+    )
+
+
+def embed_concurrency(settings: EmbeddingSettings) -> int:
+    """Embedding batches to run at once for the configured provider.
+    
+    Remote APIs serve concurrent requests. A local HuggingFace model is
+    one set of weights already using every core per forward pass, so its
+    batches run one at a time.
+    
+    Args:
+        settings: Embedding settings.
+        
+    Returns:
+        Maximum number of batches in flight.
+    """
+    if settings.embedding_provider == EmbeddingProvider.HUGGINGFACE:
+        return 1
+    return EMBED_CONCURRENCY
+
+
+def embed_documents_batched(
+    embeddings: Embeddings,
+    texts: List[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+    concurrency: int = EMBED_CONCURRENCY,
+) -> List[List[float]]:
+    """Embed texts with a given model, as concurrent batches if large.
+    
+    Batches are sent through the model's synchronous embed_documents on a
+    pool of at most `concurrency` threads. The model is usually the shared
+    instance from get_embeddings, so its async client is left to callers
+    already running in an event loop (aembed_documents_batched).
+    
+    Args:
+        embeddings: Embedding model instance.
+        texts: List of text strings to embed.
+        batch_size: Texts per embedding request.
+        concurrency: Maximum number of requests in flight.
+        
+    Returns:
+        List of embedding vectors, in the order of texts.
+    """
+    if len(texts) <= batch_size or concurrency <= 1:
+        return embeddings.embed_documents(texts)
+    
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(batches))) as pool:
+        results = list(pool.map(embeddings.embed_documents, batches))
+    return [vector for batch in results for vector in batch]
+
+
+async def aembed_texts(
+    texts: List[str],
+    settings: EmbeddingSettings | None = None,
+    batch_size: Optional[int] = None,
+    concurrency: int = EMBED_CONCURRENCY,
+) -> List[List[float]]:
+    """Generate embeddings for a list of texts with concurrent batched requests.
+    
+    Args:
+        texts: List of text strings to embed.
+        settings: Embedding settings. Loads from environment if None.
+        batch_size: Texts per embedding request. Defaults to
+            settings.embedding_batch_size.
+        concurrency: Maximum number of requests in flight, to stay within
+            provider rate limits (one for local HuggingFace models).
+        
+    Returns:
+        List of embedding vectors, in the order of texts.
+    """
+    if settings is None:
+        settings = EmbeddingSettings()
+    if batch_size is None:
+        batch_size = settings.embedding_batch_size
+    
+    concurrency = min(concurrency, embed_concurrency(settings))
+    return await aembed_documents_batched(
+        get_embeddings(settings), texts, batch_size, concurrency
+    )
+
+
+async def aembed_documents_batched(
+    embeddings: Embeddings,
+    texts: List[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+    concurrency: int = EMBED_CONCURRENCY,
+) -> List[List[float]]:
+    """Embed texts with a given model as concurrent batched requests.
+    
+    Args:
+        embeddings: Embedding model instance.
+        texts: List of text strings to embed.
+        batch_size: Texts per embedding request.
+        concurrency: Maximum number of requests in flight.
+        
+    Returns:
+        List of embedding vectors, in the order of texts.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def embed_batch(batch: List[str]) -> List[List[float]]:
+        async with semaphore:
+            return await embeddings.aembed_documents(batch)
+    
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+    return [vector for batch in results for vector in batch]
 
 
 def embed_query(query: str, settings: EmbeddingSettings | None = None) -> List[float]:
@@ -87,3 +329,48 @@ def embed_query(query: str, settings: EmbeddingSettings | None = None) -> List[f
     """
     embeddings = get_embeddings(settings)
     return embeddings.embed_query(query)
+
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize the rows of a float32 matrix in place.
+    
+    Uses a parallel Numba kernel if numba is installed (one fused pass per
+    row, spread across cores), else NumPy. Zero rows are left unchanged.
+    
+    Args:
+        vectors: (N, D) C-contiguous float32 array, modified in place.
+        
+    Returns:
+        The same array, for chaining.
+    """
+    kernel = _get_normalize_kernel()
+    if kernel is not None:
+        return kernel(vectors)
+    
+    norms = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+    norms[norms == 0] = 1.0
+    vectors /= norms[:, np.newaxis]
+    return vectors
+
+
+@lru_cache(maxsize=1)
+def _get_normalize_kernel() -> Optional[Callable[[np.ndarray], np.ndarray]]:
+    """Compile the Numba normalization kernel once; None without numba."""
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def normalize(vectors):
+        for i in prange(vectors.shape[0]):
+            total = 0.0
+            for j in range(vectors.shape[1]):
+                total += vectors[i, j] * vectors[i, j]
+            if total > 0.0:
+                inverse = 1.0 / np.sqrt(total)
+                for j in range(vectors.shape[1]):
+                    vectors[i, j] *= inverse
+        return vectors
+    
+    return normalize
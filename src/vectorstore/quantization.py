@@ -0,0 +1,517 @@
+"""Quantized vector indexes for fast candidate search."""
+
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+# Rows scored per block, bounding the float32 temporary during a scan
+SCAN_BLOCK_ROWS = 65536
+
+# Unit-vector components in [-1, 1] map to int8 codes by this factor
+INT8_UNIT_SCALE = 127.0
+
+# Product quantization: subspaces per vector (one uint8 code each),
+# centroids per subspace and k-means iterations when training codebooks
+PQ_SUBSPACES = 16
+PQ_CENTROIDS = 256
+PQ_TRAIN_ITERATIONS = 20
+
+# Vectors sampled to train PQ codebooks; k-means cost grows with it
+PQ_TRAIN_SAMPLE = 65536
+
+# Ranges and codebooks fitted on a small first batch (say, one uploaded
+# chunk) misrepresent later vectors, so an index fitted on fewer than
+# REFIT_MAX_ROWS rows is refitted once it grows REFIT_GROWTH-fold.
+# Doubling keeps the total refit work linear in the number of rows
+REFIT_GROWTH = 2
+REFIT_MAX_ROWS = 65536
+
+
+def quantize_unit(vectors: np.ndarray) -> np.ndarray:
+    """Symmetric int8 codes for L2-normalized vectors.
+    
+    Args:
+        vectors: (N, D) or (D,) float array with components in [-1, 1].
+    
+    Returns:
+        int8 codes of the same shape.
+    """
+    return np.rint(np.asarray(vectors) * INT8_UNIT_SCALE).astype(np.int8)
+
+
+def int8_dot_batch(codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Dot products of an int8 query against every int8 code row.
+    
+    Uses simsimd if available, whose int8 kernels run on AVX-512 VNNI /
+    AVX-VNNI (vpdpbusd) where the CPU supports it; otherwise scores
+    SCAN_BLOCK_ROWS-row float32 blocks with BLAS.
+    
+    Args:
+        codes: (N, D) int8 matrix.
+        query: (D,) int8 vector.
+    
+    Returns:
+        (N,) float32 dot products.
+    """
+    if not len(codes):
+        return np.empty(0, dtype=np.float32)
+    
+    try:
+        import simsimd
+    except ImportError:
+        return _int8_dot_blocks(codes, query)
+    
+    dots = simsimd.cdist(query[np.newaxis], codes, metric="dot")
+    return np.asarray(dots, dtype=np.float32).reshape(-1)
+
+
+def _int8_dot_blocks(codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """int8_dot_batch fallback: float32 BLAS over SCAN_BLOCK_ROWS-row blocks."""
+    weights = query.astype(np.float32)
+    dots = np.empty(len(codes), dtype=np.float32)
+    for start in range(0, len(codes), SCAN_BLOCK_ROWS):
+        block = codes[start:start + SCAN_BLOCK_ROWS]
+        dots[start:start + len(block)] = block.astype(np.float32) @ weights
+    return dots
+
+
+def _outgrown(rows: int, fit_size: int) -> bool:
+    """Whether an index fitted on fit_size rows should be refitted at rows."""
+    return 0 < fit_size < REFIT_MAX_ROWS and rows >= REFIT_GROWTH * fit_size
+
+
+class Int8Index:
+    """Per-dimension 8-bit scalar quantization of stored vectors.
+    
+    Each dimension is mapped linearly from its [min, max] range (fitted on
+    the first batch added, then refitted by the owner while needs_refit)
+    to 0..255, so a vector costs one byte per dimension instead of four.
+    Search is asymmetric: the query stays float32 and is scored against
+    the codes, giving approximate squared L2 distances good enough to
+    shortlist candidates for exact reranking.
+    """
+    
+    def __init__(self):
+        """Initialize an empty, unfitted index."""
+        self.ids: List[str] = []
+        self.codes: Optional[np.ndarray] = None
+        self.lo: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+        # Squared norms of the dequantized vectors, for L2 scoring
+        self.sq_norms: Optional[np.ndarray] = None
+        # Rows the ranges were fitted on
+        self.fit_size = 0
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @property
+    def needs_refit(self) -> bool:
+        """Whether the index has outgrown the rows its ranges were fitted on."""
+        return _outgrown(len(self), self.fit_size)
+    
+    def fit(self, vectors: np.ndarray) -> None:
+        """Set per-dimension ranges from a batch of vectors.
+        
+        Args:
+            vectors: (N, D) float array.
+        """
+        self.fit_size = len(vectors)
+        self.lo = vectors.min(axis=0).astype(np.float32)
+        scale = (vectors.max(axis=0) - self.lo) / 255.0
+        # Constant dimensions would divide by zero; any scale decodes them
+        scale[scale == 0] = 1.0
+        self.scale = scale.astype(np.float32)
+    
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Quantize vectors to uint8 codes, clipping values outside the range.
+        
+        Args:
+            vectors: (N, D) float array.
+        
+        Returns:
+            (N, D) uint8 codes.
+        """
+        assert self.lo is not None and self.scale is not None, "Int8Index is not fitted"
+        codes: np.ndarray = np.clip(np.rint((vectors - self.lo) / self.scale), 0, 255)
+        return codes.astype(np.uint8)
+    
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Approximate float32 vectors from codes."""
+        assert self.lo is not None and self.scale is not None, "Int8Index is not fitted"
+        decoded: np.ndarray = codes.astype(np.float32) * self.scale + self.lo
+        return decoded
+    
+    def add(self, ids: List[str], vectors: np.ndarray) -> None:
+        """Quantize and append vectors, fitting ranges on first use.
+        
+        Args:
+            ids: Document IDs, one per vector.
+            vectors: (N, D) float array.
+        """
+        if not ids:
+            return
+        
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.lo is None:
+            self.fit(vectors)
+        
+        codes = self.encode(vectors)
+        decoded = self.decode(codes)
+        sq_norms = np.einsum("ij,ij->i", decoded, decoded)
+        
+        if self.codes is None or self.sq_norms is None:
+            self.codes, self.sq_norms = codes, sq_norms
+        else:
+            self.codes = np.concatenate([self.codes, codes])
+            self.sq_norms = np.concatenate([self.sq_norms, sq_norms])
+        self.ids.extend(ids)
+    
+    def remove(self, ids: List[str]) -> None:
+        """Drop vectors by document ID (unknown IDs are ignored)."""
+        drop = set(ids)
+        keep = np.array([i not in drop for i in self.ids], dtype=bool)
+        if keep.all():
+            return
+        
+        assert self.codes is not None and self.sq_norms is not None
+        self.ids = [i for i, kept in zip(self.ids, keep) if kept]
+        self.codes = self.codes[keep]
+        self.sq_norms = self.sq_norms[keep]
+    
+    def clear(self) -> None:
+        """Remove all vectors and fitted ranges."""
+        self.ids = []
+        self.codes = self.sq_norms = self.lo = self.scale = None
+        self.fit_size = 0
+    
+    def search(self, query: np.ndarray, n: int) -> List[str]:
+        """Shortlist the n nearest IDs by approximate squared L2 distance.
+        
+        ||q - x||^2 = ||q||^2 - 2 q.x + ||x||^2, and with x = lo + scale * c,
+        q.x = q.lo + (q * scale).c, so only one dot product per code row
+        is needed; ||q||^2 is constant and dropped.
+        
+        Args:
+            query: (D,) float query vector.
+            n: Number of candidates.
+        
+        Returns:
+            Up to n IDs, nearest first.
+        """
+        if not self.ids:
+            return []
+        
+        assert self.codes is not None and self.sq_norms is not None
+        assert self.lo is not None and self.scale is not None
+        query = np.asarray(query, dtype=np.float32)
+        weights = query * self.scale
+        offset = float(query @ self.lo)
+        
+        total = len(self.ids)
+        dots = np.empty(total, dtype=np.float32)
+        for start in range(0, total, SCAN_BLOCK_ROWS):
+            block = self.codes[start:start + SCAN_BLOCK_ROWS]
+            dots[start:start + len(block)] = block @ weights
+        distances = self.sq_norms - 2.0 * (dots + offset)
+        
+        n = min(n, total)
+        nearest = np.argpartition(distances, n - 1)[:n]
+        nearest = nearest[np.argsort(distances[nearest])]
+        return [self.ids[i] for i in nearest]
+    
+    def save(self, path: Path) -> None:
+        """Write the index to an .npz file."""
+        if self.codes is None or self.sq_norms is None:
+            if path.exists():
+                path.unlink()
+            return
+        
+        assert self.lo is not None and self.scale is not None
+        np.savez(
+            path,
+            ids=np.array(self.ids, dtype=str),
+            codes=self.codes,
+            lo=self.lo,
+            scale=self.scale,
+            sq_norms=self.sq_norms,
+            fit_size=self.fit_size,
+        )
+    
+    @classmethod
+    def load(cls, path: Path) -> "Int8Index":
+        """Read an index written by save, or return an empty one."""
+        index = cls()
+        if not path.exists():
+            return index
+        
+        with np.load(path) as data:
+            index.ids = data["ids"].tolist()
+            index.codes = data["codes"]
+            index.lo = data["lo"]
+            index.scale = data["scale"]
+            index.sq_norms = data["sq_norms"]
+            # Files written before fit_size was tracked count as fully fitted
+            index.fit_size = (
+                int(data["fit_size"]) if "fit_size" in data.files else len(index.ids)
+            )
+        return index
+
+
+class PQIndex:
+    """Product-quantized index of stored vectors.
+    
+    Each vector is split into PQ_SUBSPACES equal subvectors, and each
+    subvector is replaced by the uint8 ID of its nearest centroid in a
+    per-subspace k-means codebook. A 1536-dim float32 vector then costs
+    16 bytes instead of 6 KB. Search is asymmetric: the query's squared
+    distances to every centroid are tabulated once, and each stored vector
+    is scored by summing one table entry per subspace.
+    
+    Codebooks are trained once PQ_CENTROIDS vectors have been added (and
+    retrained by the owner while needs_refit). Until then the vectors are
+    kept exactly and searched by a full scan, since codebooks trained on a
+    handful of vectors (one uploaded chunk, say) would give every later
+    vector the same codes.
+    """
+    
+    def __init__(self, subspaces: int = PQ_SUBSPACES):
+        """Initialize an empty, untrained index.
+        
+        Args:
+            subspaces: Number of subvectors; must divide the vector dimension.
+        """
+        self.subspaces = subspaces
+        self.ids: List[str] = []
+        self.codes: Optional[np.ndarray] = None
+        # (subspaces, centroids, subvector dim)
+        self.codebooks: Optional[np.ndarray] = None
+        # Exact (N, D) vectors, held until there are enough to train on
+        self.pending: Optional[np.ndarray] = None
+        # Rows the codebooks were trained on
+        self.fit_size = 0
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @property
+    def needs_refit(self) -> bool:
+        """Whether the index has outgrown the rows its codebooks were trained on."""
+        return _outgrown(len(self), self.fit_size)
+    
+    def _check_dimension(self, dim: int) -> None:
+        """Raise ValueError unless dim splits evenly into the subspaces."""
+        if dim % self.subspaces:
+            raise ValueError(
+                f"Dimension {dim} not divisible by {self.subspaces} subspaces"
+            )
+    
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        """Reshape (N, D) vectors to (subspaces, N, D / subspaces)."""
+        n, dim = vectors.shape
+        split = vectors.reshape(n, self.subspaces, dim // self.subspaces)
+        transposed: np.ndarray = split.transpose(1, 0, 2)
+        return transposed
+    
+    def fit(self, vectors: np.ndarray) -> None:
+        """Train one k-means codebook per subspace.
+        
+        Args:
+            vectors: (N, D) float array. Uses min(N, PQ_CENTROIDS) centroids,
+                trained on a sample of at most PQ_TRAIN_SAMPLE vectors.
+        
+        Raises:
+            ValueError: If D is not divisible by the number of subspaces.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self._check_dimension(vectors.shape[1])
+        
+        self.fit_size = len(vectors)
+        rng = np.random.default_rng(0)
+        if len(vectors) > PQ_TRAIN_SAMPLE:
+            sample = rng.choice(len(vectors), PQ_TRAIN_SAMPLE, replace=False)
+            vectors = vectors[sample]
+        
+        centroids = min(len(vectors), PQ_CENTROIDS)
+        codebooks = []
+        for sub in self._split(vectors):
+            codebook = sub[rng.choice(len(sub), centroids, replace=False)]
+            for _ in range(PQ_TRAIN_ITERATIONS):
+                assignment = _nearest_centroids(sub, codebook)
+                counts = np.bincount(assignment, minlength=centroids)
+                sums = np.zeros_like(codebook)
+                np.add.at(sums, assignment, sub)
+                # Empty clusters keep their previous centroid
+                filled = counts > 0
+                codebook[filled] = sums[filled] / counts[filled, np.newaxis]
+            codebooks.append(codebook)
+        self.codebooks = np.stack(codebooks)
+    
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Assign each subvector its nearest centroid.
+        
+        Args:
+            vectors: (N, D) float array.
+        
+        Returns:
+            (N, subspaces) uint8 codes.
+        """
+        assert self.codebooks is not None, "PQIndex is not trained"
+        subs = self._split(np.asarray(vectors, dtype=np.float32))
+        codes = [
+            _nearest_centroids(sub, codebook)
+            for sub, codebook in zip(subs, self.codebooks)
+        ]
+        return np.stack(codes, axis=1).astype(np.uint8)
+    
+    def add(self, ids: List[str], vectors: np.ndarray) -> None:
+        """Encode and append vectors, training codebooks once there are enough.
+        
+        Args:
+            ids: Document IDs, one per vector.
+            vectors: (N, D) float array.
+        
+        Raises:
+            ValueError: If D is not divisible by the number of subspaces.
+        """
+        if not ids:
+            return
+        
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self._check_dimension(vectors.shape[1])
+        self.ids.extend(ids)
+        
+        if self.codebooks is None:
+            held = (
+                vectors if self.pending is None
+                else np.concatenate([self.pending, vectors])
+            )
+            if len(held) < PQ_CENTROIDS:
+                self.pending = held
+                return
+            self.fit(held)
+            self.codes, self.pending = self.encode(held), None
+            return
+        
+        codes = self.encode(vectors)
+        self.codes = (
+            codes if self.codes is None else np.concatenate([self.codes, codes])
+        )
+    
+    def remove(self, ids: List[str]) -> None:
+        """Drop vectors by document ID (unknown IDs are ignored)."""
+        drop = set(ids)
+        keep = np.array([i not in drop for i in self.ids], dtype=bool)
+        if keep.all():
+            return
+        
+        self.ids = [i for i, kept in zip(self.ids, keep) if kept]
+        if self.codes is not None:
+            self.codes = self.codes[keep]
+        if self.pending is not None:
+            self.pending = self.pending[keep]
+    
+    def clear(self) -> None:
+        """Remove all vectors and trained codebooks."""
+        self.ids = []
+        self.codes = self.codebooks = self.pending = None
+        self.fit_size = 0
+    
+    def search(self, query: np.ndarray, n: int) -> List[str]:
+        """Shortlist the n nearest IDs by approximate squared L2 distance.
+        
+        Distances are exact while the index is untrained.
+        
+        Args:
+            query: (D,) float query vector.
+            n: Number of candidates.
+        
+        Returns:
+            Up to n IDs, nearest first.
+        """
+        if not self.ids:
+            return []
+        
+        query = np.asarray(query, dtype=np.float32)
+        total = len(self.ids)
+        if self.codebooks is None or self.codes is None:
+            assert self.pending is not None
+            distances = ((self.pending - query) ** 2).sum(axis=1)
+        else:
+            subs = query.reshape(self.subspaces, 1, -1)
+            # (subspaces, centroids) squared distances from each query subvector
+            table = ((self.codebooks - subs) ** 2).sum(axis=2)
+            rows = np.arange(self.subspaces)
+            distances = np.empty(total, dtype=np.float32)
+            for start in range(0, total, SCAN_BLOCK_ROWS):
+                block = self.codes[start:start + SCAN_BLOCK_ROWS]
+                distances[start:start + len(block)] = table[rows, block].sum(axis=1)
+        
+        n = min(n, total)
+        nearest = np.argpartition(distances, n - 1)[:n]
+        nearest = nearest[np.argsort(distances[nearest])]
+        return [self.ids[i] for i in nearest]
+    
+    def save(self, path: Path) -> None:
+        """Write the index to an .npz file."""
+        if not self.ids:
+            if path.exists():
+                path.unlink()
+            return
+        
+        if self.codebooks is None:
+            assert self.pending is not None
+            np.savez(
+                path,
+                ids=np.array(self.ids, dtype=str),
+                pending=self.pending,
+                subspaces=self.subspaces,
+            )
+            return
+        
+        assert self.codes is not None
+        np.savez(
+            path,
+            ids=np.array(self.ids, dtype=str),
+            codes=self.codes,
+            codebooks=self.codebooks,
+            fit_size=self.fit_size,
+        )
+    
+    @classmethod
+    def load(cls, path: Path, subspaces: int = PQ_SUBSPACES) -> "PQIndex":
+        """Read an index written by save, or return an empty one.
+        
+        Args:
+            path: .npz file path.
+            subspaces: Subspaces for an empty index; a saved index keeps its own.
+        """
+        index = cls(subspaces)
+        if not path.exists():
+            return index
+        
+        with np.load(path) as data:
+            index.ids = data["ids"].tolist()
+            if "pending" in data.files:
+                index.pending = data["pending"]
+                index.subspaces = int(data["subspaces"])
+                return index
+            
+            index.codes = data["codes"]
+            index.codebooks = data["codebooks"]
+            index.fit_size = (
+                int(data["fit_size"]) if "fit_size" in data.files else len(index.ids)
+            )
+        index.subspaces = len(index.codebooks)
+        return index
+
+
+def _nearest_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest centroid (squared L2) for each row of vectors."""
+    distances = (
+        np.einsum("ij,ij->i", centroids, centroids)[np.newaxis]
+        - 2.0 * vectors @ centroids.T
+    )
+    nearest: np.ndarray = distances.argmin(axis=1)
+    return nearest
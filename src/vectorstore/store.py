@@ -1,12 +1,58 @@
 """Vector store implementations for document storage and retrieval."""
 
+import asyncio
+import json
+import threading
+import uuid
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, List, Literal, Optional, Union
 
-from langchain_chroma import Chroma
+import numpy as np
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 
-from src.vectorstore.embeddings import EmbeddingSettings, get_embeddings
+from src.vectorstore.embeddings import (
+    EmbeddingSettings,
+    aembed_documents_batched,
+    embed_concurrency,
+    embed_documents_batched,
+    get_embeddings,
+    l2_normalize,
+)
+from src.vectorstore.quantization import (
+    PQ_SUBSPACES,
+    REFIT_MAX_ROWS,
+    Int8Index,
+    PQIndex,
+    int8_dot_batch,
+    quantize_unit,
+)
+
+if TYPE_CHECKING:
+    from langchain_chroma import Chroma
+
+# Candidates shortlisted from the int8 index per requested result
+RERANK_FACTOR = 4
+
+# Coarser product-quantized distances need a longer shortlist
+PQ_RERANK_FACTOR = 16
+
+# A persisted quantized index is rewritten once the rows added or removed
+# since its last save reach the larger of this and its current size, so
+# total write volume stays linear in the rows ingested
+INDEX_SAVE_MIN_ROWS = 1024
+
+# Vectors fetched from Chroma per page when rebuilding a quantized index;
+# the first page is what the index is fitted on
+INDEX_REBUILD_PAGE_ROWS = REFIT_MAX_ROWS
+
+# Recent (query, k, filter) results kept per store with cache_searches;
+# cleared on any write through that store
+SEARCH_CACHE_SIZE = 128
+
+# Initial row capacity of InMemoryStore's matrix; doubled when full
+INMEMORY_INITIAL_CAPACITY = 1024
 
 
 class VectorStoreError(Exception):
@@ -27,6 +73,7 @@ class ChromaStore:
         collection_name: str = "documents",
         persist_directory: Optional[Path] = None,
         embedding_settings: Optional[EmbeddingSettings] = None,
+        cache_searches: bool = False,
     ):
         """Initialize ChromaDB store.
         
@@ -34,30 +81,70 @@ class ChromaStore:
             collection_name: Name for the collection.
             persist_directory: Path for persistent storage. Uses in-memory if None.
             embedding_settings: Embedding configuration. Loads from env if None.
+            cache_searches: Cache recent search results until this store's
+                next write. Only safe when this instance is the collection's
+                sole writer: writes made through other stores or processes
+                (even on the same in-memory collection) are not seen.
         """
         self.collection_name = collection_name
         self.persist_directory = persist_directory
         self._embedding_settings = embedding_settings
-        self._store: Optional[Chroma] = None
+        self._store: Optional["Chroma"] = None
+        self.cache_searches = cache_searches
+        self._search_cache: OrderedDict = OrderedDict()
+        # Bumped on every write, so searches that overlapped one aren't cached
+        self._cache_generation = 0
+        # Guards lazy initialization and the search cache (and, in
+        # QuantizedChromaStore, the index) for searches on several threads
+        self._lock = threading.RLock()
     
     @property
-    def store(self) -> Chroma:
+    def store(self) -> "Chroma":
         """Lazy initialization of Chroma store."""
         if self._store is None:
-            embeddings = get_embeddings(self._embedding_settings)
-            
-            kwargs = {
-                "collection_name": self.collection_name,
-                "embedding_function": embeddings,
-            }
-            
-            if self.persist_directory:
-                kwargs["persist_directory"] = str(self.persist_directory)
-            
-            self._store = Chroma(**kwargs)
+            with self._lock:
+                if self._store is None:
+                    self._store = self._open_store()
         
         return self._store
     
+    def _open_store(self) -> "Chroma":
+        """Create the Chroma store for this collection."""
+        # Imported on first use: chromadb is slow to import and unused
+        # by InMemoryStore and callers that never open a store
+        from langchain_chroma import Chroma
+        
+        embeddings = get_embeddings(self._embedding_settings)
+        
+        kwargs = {
+            "collection_name": self.collection_name,
+            "embedding_function": embeddings,
+        }
+        
+        if self.persist_directory:
+            kwargs["persist_directory"] = str(self.persist_directory)
+        
+        return Chroma(**kwargs)
+    
+    def warm(self) -> None:
+        """Open the store now rather than on first use.
+        
+        Call before sharing the store between threads, so they don't all
+        wait on the first search to open it.
+        """
+        self.store
+    
+    def flush(self) -> None:
+        """Write any state not yet persisted; Chroma persists its own writes."""
+    
+    @property
+    def embeddings(self) -> Embeddings:
+        """Embedding model of the Chroma store."""
+        embeddings = self.store.embeddings
+        # Always set: the store is created with an embedding function
+        assert embeddings is not None
+        return embeddings
+    
     def add_documents(self, documents: List[Document]) -> List[str]:
         """Add documents to the vector store.
         
@@ -73,11 +160,98 @@ class ChromaStore:
         if not documents:
             return []
         
+        settings = self._embedding_settings or EmbeddingSettings()
+        texts = [doc.page_content for doc in documents]
         try:
-            ids = self.store.add_documents(documents)
-            return ids
+            vectors = embed_documents_batched(
+                self.embeddings,
+                texts,
+                settings.embedding_batch_size,
+                embed_concurrency(settings),
+            )
         except Exception as e:
             raise VectorStoreError(f"Failed to add documents: {e}")
+        
+        return self._write_embedded(documents, texts, vectors)
+    
+    async def aadd_documents(self, documents: List[Document]) -> List[str]:
+        """Add documents without blocking the event loop.
+        
+        Embeds with concurrent batched requests, then runs the Chroma write
+        (and its SQLite commit) in a worker thread, so async callers keep
+        serving other requests during bulk ingestion.
+        
+        Args:
+            documents: List of documents to add.
+            
+        Returns:
+            List of document IDs.
+            
+        Raises:
+            VectorStoreError: If adding documents fails.
+        """
+        if not documents:
+            return []
+        
+        settings = self._embedding_settings or EmbeddingSettings()
+        texts = [doc.page_content for doc in documents]
+        try:
+            vectors = await aembed_documents_batched(
+                self.embeddings,
+                texts,
+                settings.embedding_batch_size,
+                embed_concurrency(settings),
+            )
+        except Exception as e:
+            raise VectorStoreError(f"Failed to add documents: {e}")
+        
+        return await asyncio.to_thread(self._write_embedded, documents, texts, vectors)
+    
+    def _write_embedded(
+        self,
+        documents: List[Document],
+        texts: List[str],
+        vectors: List[List[float]],
+    ) -> List[str]:
+        """Write pre-embedded documents to Chroma directly.
+        
+        Chroma.add_documents embeds in one request and splits the write into
+        separate upserts for documents with and without metadata; here each
+        max-size batch is written with a single pre-embedded upsert, so
+        re-ingesting a document under an existing ID replaces it.
+        
+        Args:
+            documents: Non-empty list of documents to add.
+            texts: Their page contents.
+            vectors: Their embeddings.
+            
+        Returns:
+            List of document IDs.
+            
+        Raises:
+            VectorStoreError: If writing fails.
+        """
+        ids = [doc.id or str(uuid.uuid4()) for doc in documents]
+        embeddings = np.asarray(vectors, dtype=np.float32)
+        # Chroma rejects empty metadata dicts
+        metadatas: List[Any] = [doc.metadata or None for doc in documents]
+        try:
+            collection = self.store._collection
+            step = self.store._client.get_max_batch_size()
+            for start in range(0, len(ids), step):
+                end = start + step
+                collection.upsert(
+                    ids=ids[start:end],
+                    embeddings=embeddings[start:end],
+                    documents=texts[start:end],
+                    metadatas=metadatas[start:end],
+                )
+        except Exception as e:
+            raise VectorStoreError(f"Failed to add documents: {e}")
+        finally:
+            self._clear_search_cache()
+        
+        return ids
     
     def similarity_search(
         self,
@@ -95,7 +269,8 @@ class ChromaStore:
         Returns:
             List of similar documents, ordered by relevance.
         """
-        return self.store.similarity_search(query, k=k, filter=filter)
+        results = self.similarity_search_with_score(query, k=k, filter=filter)
+        return [doc for doc, _ in results]
     
     def similarity_search_with_score(
         self,
@@ -105,6 +280,11 @@ class ChromaStore:
     ) -> List[tuple[Document, float]]:
         """Search for similar documents with relevance scores.
         
+        With cache_searches, the last SEARCH_CACHE_SIZE distinct searches
+        are cached until the store is next modified, so repeated queries
+        skip both the query embedding and the index search. Callers get
+        copies of the cached documents, which they may modify.
+        
         Args:
             query: Search query text.
             k: Number of results to return.
@@ -113,6 +293,41 @@ class ChromaStore:
         Returns:
             List of (document, score) tuples, ordered by relevance.
         """
+        if not self.cache_searches:
+            return self._search_with_score(query, k, filter)
+        
+        key = (query, k, json.dumps(filter, sort_keys=True, default=str))
+        with self._lock:
+            cached = self._search_cache.get(key)
+            if cached is not None:
+                self._search_cache.move_to_end(key)
+            generation = self._cache_generation
+        if cached is not None:
+            return _copy_results(cached)
+        
+        # Searched outside the lock, so concurrent searches don't serialize
+        results = self._search_with_score(query, k, filter)
+        with self._lock:
+            # A write since the lookup may have made these results stale
+            if generation == self._cache_generation:
+                self._search_cache[key] = results
+                if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+        return _copy_results(results)
+    
+    def _clear_search_cache(self) -> None:
+        """Drop cached searches, and those still running, after a write."""
+        with self._lock:
+            self._search_cache.clear()
+            self._cache_generation += 1
+    
+    def _search_with_score(
+        self,
+        query: str,
+        k: int,
+        filter: Optional[dict],
+    ) -> List[tuple[Document, float]]:
+        """Uncached scored search; the one call every search goes through."""
         return self.store.similarity_search_with_score(query, k=k, filter=filter)
     
     def delete(self, ids: List[str]) -> None:
@@ -121,7 +336,485 @@ class ChromaStore:
         Args:
             ids: List of document IDs to delete.
         """
-        self.store.delete(ids)
+        try:
+            self.store.delete(ids)
+        finally:
+            self._clear_search_cache()
+    
+    def count(self) -> int:
+        """Get number of documents in store.
+        
+        Returns:
+            Document count.
+        """
+        # COUNT(*) in Chroma instead of transferring every ID
+        return self.store._collection.count()
+    
+    def clear(self) -> None:
+        """Remove all documents from store."""
+        # IDs only; the default get() also loads every document and metadata
+        all_ids = self.store._collection.get(include=[])["ids"]
+        try:
+            if all_ids:
+                self.store.delete(all_ids)
+        finally:
+            self._clear_search_cache()
+
+
+class QuantizedChromaStore(ChromaStore):
+    """ChromaStore with a quantized search index.
+    
+    Documents are stored in Chroma as usual (full float32 vectors). A
+    second, compressed copy of the vectors is kept in a quantized index,
+    saved next to the Chroma files when persisting:
+    
+    - "int8": Int8Index, one byte per dimension (4x smaller).
+    - "pq": PQIndex, one byte per subspace (e.g. 384x smaller for
+      1536-dim vectors in 16 subspaces), for very large collections.
+    
+    Unfiltered searches scan the codes to shortlist candidates
+    (RERANK_FACTOR or PQ_RERANK_FACTOR per result), then rerank those by
+    exact squared L2 distance (Chroma's default metric) using the float32
+    vectors fetched from Chroma.
+    
+    The index file is rewritten only every so often (see
+    INDEX_SAVE_MIN_ROWS); call flush() before exiting to save the rest.
+    Until then the outdated file is removed, so a store reopened without
+    a flush rebuilds its index from Chroma.
+    """
+    
+    INDEX_FILENAME = "int8_index.npz"
+    PQ_INDEX_FILENAME = "pq_index.npz"
+    
+    def __init__(
+        self,
+        collection_name: str = "documents",
+        persist_directory: Optional[Path] = None,
+        embedding_settings: Optional[EmbeddingSettings] = None,
+        quantization: Literal["int8", "pq"] = "int8",
+        pq_subspaces: int = PQ_SUBSPACES,
+        cache_searches: bool = False,
+    ):
+        """Initialize quantized ChromaDB store.
+        
+        Args:
+            collection_name: Name for the collection.
+            persist_directory: Path for persistent storage. Uses in-memory if None.
+            embedding_settings: Embedding configuration. Loads from env if None.
+            quantization: Index type, "int8" or "pq".
+            pq_subspaces: Subvectors per vector for "pq"; must divide the
+                embedding dimension.
+            cache_searches: Cache recent search results (see ChromaStore).
+        
+        Raises:
+            ValueError: If quantization is not "int8" or "pq".
+        """
+        if quantization not in ("int8", "pq"):
+            raise ValueError(f"Unknown quantization: {quantization}")
+        
+        super().__init__(
+            collection_name, persist_directory, embedding_settings, cache_searches
+        )
+        self.quantization = quantization
+        pq = quantization == "pq"
+        self._rerank_factor = PQ_RERANK_FACTOR if pq else RERANK_FACTOR
+        
+        filename = self.PQ_INDEX_FILENAME if pq else self.INDEX_FILENAME
+        self._index_path = (
+            Path(persist_directory) / f"{collection_name}_{filename}"
+            if persist_directory
+            else None
+        )
+        self._index: Union[Int8Index, PQIndex]
+        if pq:
+            self._index = (
+                PQIndex.load(self._index_path, pq_subspaces)
+                if self._index_path
+                else PQIndex(pq_subspaces)
+            )
+        else:
+            self._index = (
+                Int8Index.load(self._index_path) if self._index_path else Int8Index()
+            )
+        self._index_checked = False
+        # Rows added or removed since the index file was last written
+        self._unsaved_rows = 0
+    
+    def _ensure_index(self) -> None:
+        """Rebuild the index from Chroma if it is out of sync or outgrown.
+        
+        Covers collections persisted before the index existed, or whose
+        index file is missing or stale (checked once per store), and
+        indexes grown well past the rows they were fitted on, e.g. after
+        documents were ingested one upload at a time.
+        """
+        with self._lock:
+            if not self._index_checked:
+                self._index_checked = True
+                if len(self._index) != self.store._collection.count():
+                    self._rebuild_index()
+                    return
+            
+            if self._index.needs_refit:
+                self._rebuild_index()
+    
+    def warm(self) -> None:
+        """Open the store and bring the quantized index up to date."""
+        super().warm()
+        self._ensure_index()
+    
+    def _rebuild_index(self) -> None:
+        """Refit the quantized index on every vector stored in Chroma.
+        
+        Vectors are fetched INDEX_REBUILD_PAGE_ROWS at a time, so the
+        float32 copy of the collection is never held at once.
+        """
+        collection = self.store._collection
+        self._index.clear()
+        for offset in range(0, collection.count(), INDEX_REBUILD_PAGE_ROWS):
+            page = collection.get(
+                include=["embeddings"], limit=INDEX_REBUILD_PAGE_ROWS, offset=offset
+            )
+            vectors = np.asarray(page["embeddings"], dtype=np.float32)
+            self._index.add(page["ids"], vectors)
+        self._unsaved_rows = len(self._index)
+        self.flush()
+    
+    def _index_changed(self, rows: int) -> None:
+        """Record rows added to or removed from the index, saving it when due.
+        
+        Rewriting the file on every write would make ingesting one upload
+        at a time quadratic in disk writes.
+        """
+        if not self._index_path:
+            return
+        
+        if not self._unsaved_rows and self._index_path.exists():
+            # The file no longer matches; don't let a reopened store trust it
+            self._index_path.unlink()
+        self._unsaved_rows += rows
+        if self._unsaved_rows >= max(INDEX_SAVE_MIN_ROWS, len(self._index)):
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write unsaved quantized index changes next to the Chroma files."""
+        with self._lock:
+            if self._index_path and self._unsaved_rows:
+                self._index.save(self._index_path)
+            self._unsaved_rows = 0
+    
+    def _write_embedded(
+        self,
+        documents: List[Document],
+        texts: List[str],
+        vectors: List[List[float]],
+    ) -> List[str]:
+        """Write pre-embedded documents to Chroma and the quantized index."""
+        # Held throughout, so no search sees Chroma and the index disagree
+        with self._lock:
+            ids = super()._write_embedded(documents, texts, vectors)
+            # Documents with explicit IDs may replace stored ones (upsert)
+            replaced = [doc.id for doc in documents if doc.id]
+            if replaced:
+                self._index.remove(replaced)
+            self._index.add(ids, np.asarray(vectors, dtype=np.float32))
+            self._index_changed(len(ids))
+        return ids
+    
+    def _search_with_score(
+        self,
+        query: str,
+        k: int,
+        filter: Optional[dict],
+    ) -> List[tuple[Document, float]]:
+        """Search via the quantized index, reranked by exact squared L2 distance.
+        
+        Filtered searches go to Chroma directly, since the index holds no
+        metadata.
+        """
+        if filter is not None:
+            return super()._search_with_score(query, k, filter)
+        
+        self._ensure_index()
+        if not len(self._index):
+            return []
+        
+        query_vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        # Writes and rebuilds modify the index in place
+        with self._lock:
+            candidates = self._index.search(query_vector, self._rerank_factor * k)
+        if not candidates:
+            return []
+        
+        found = self.store._collection.get(
+            ids=candidates,
+            include=["embeddings", "documents", "metadatas"],
+        )
+        vectors = np.asarray(found["embeddings"], dtype=np.float32)
+        distances = ((vectors - query_vector) ** 2).sum(axis=1)
+        
+        texts = found["documents"] or []
+        metadatas = found["metadatas"] or []
+        results = [
+            (
+                Document(page_content=text, metadata=dict(metadata or {}), id=doc_id),
+                float(distance),
+            )
+            for doc_id, text, metadata, distance in zip(
+                found["ids"], texts, metadatas, distances
+            )
+        ]
+        results.sort(key=lambda result: result[1])
+        return results[:k]
+    
+    def delete(self, ids: List[str]) -> None:
+        """Delete documents by ID.
+        
+        Args:
+            ids: List of document IDs to delete.
+        """
+        with self._lock:
+            super().delete(ids)
+            self._index.remove(ids)
+            self._index_changed(len(ids))
+    
+    def clear(self) -> None:
+        """Remove all documents from store."""
+        with self._lock:
+            super().clear()
+            self._index.clear()
+            if self._index_path:
+                # Saving an empty index removes its file
+                self._index.save(self._index_path)
+            self._unsaved_rows = 0
+
+
+def _copy_results(
+    results: List[tuple[Document, float]],
+) -> List[tuple[Document, float]]:
+    """Deep copies of scored documents, so callers can't alter stored state."""
+    return [(doc.model_copy(deep=True), score) for doc, score in results]
+
+
+class InMemoryStore:
+    """In-process vector store searched with a single NumPy matmul.
+    
+    For collections that fit in RAM, scoring a query against one
+    contiguous (N, D) float32 matrix is a single BLAS call, avoiding
+    Chroma's HNSW and SQLite round trips. Vectors are L2-normalized on
+    insert, so the matmul gives cosine similarities. Nothing is persisted.
+    
+    With quantize=True, an int8 copy of the matrix is also kept and
+    scanned first (VNNI int8 dot products via simsimd when installed) to
+    shortlist RERANK_FACTOR * k candidates, which are then reranked with
+    the float32 vectors.
+    
+    Offers the same methods as ChromaStore. Scores are cosine distances
+    (1 - cosine similarity), so lower is more relevant, as with Chroma.
+    """
+    
+    def __init__(
+        self,
+        embedding_settings: Optional[EmbeddingSettings] = None,
+        initial_capacity: int = INMEMORY_INITIAL_CAPACITY,
+        quantize: bool = False,
+    ):
+        """Initialize an empty in-memory store.
+        
+        Args:
+            embedding_settings: Embedding configuration. Loads from env if None.
+            initial_capacity: Rows preallocated before the first resize.
+            quantize: Shortlist candidates with an int8 scan before scoring.
+        """
+        self._embedding_settings = embedding_settings
+        self._embeddings: Optional[Embeddings] = None
+        self._initial_capacity = max(1, initial_capacity)
+        self.quantize = quantize
+        # Preallocated (capacity, dim) rows; empty until the first add
+        self._mat = np.empty((0, 0), dtype=np.float32)
+        # int8 codes of the rows in _mat, kept only when quantize is set
+        self._codes = np.empty((0, 0), dtype=np.int8)
+        self._size = 0
+        self._ids: List[str] = []
+        self._docs: List[Document] = []
+    
+    @property
+    def embeddings(self) -> Embeddings:
+        """Lazy initialization of the embedding model."""
+        if self._embeddings is None:
+            self._embeddings = get_embeddings(self._embedding_settings)
+        return self._embeddings
+    
+    def warm(self) -> None:
+        """Load the embedding model now rather than on first use."""
+        self.embeddings
+    
+    def flush(self) -> None:
+        """Nothing to persist; kept for parity with ChromaStore."""
+    
+    def _reserve(self, rows: int, dim: int) -> None:
+        """Ensure capacity for rows more vectors, doubling the matrix as needed."""
+        needed = self._size + rows
+        if not len(self._mat):
+            capacity = max(self._initial_capacity, needed)
+            self._mat = np.empty((capacity, dim), dtype=np.float32)
+            if self.quantize:
+                self._codes = np.empty((capacity, dim), dtype=np.int8)
+            return
+        
+        if needed <= len(self._mat):
+            return
+        
+        capacity = len(self._mat)
+        while capacity < needed:
+            capacity *= 2
+        grown = np.empty((capacity, dim), dtype=np.float32)
+        grown[:self._size] = self._mat[:self._size]
+        self._mat = grown
+        if self.quantize:
+            grown_codes = np.empty((capacity, dim), dtype=np.int8)
+            grown_codes[:self._size] = self._codes[:self._size]
+            self._codes = grown_codes
+    
+    def add_documents(self, documents: List[Document]) -> List[str]:
+        """Add documents to the vector store.
+        
+        Args:
+            documents: List of documents to add.
+            
+        Returns:
+            List of document IDs.
+            
+        Raises:
+            VectorStoreError: If embedding the documents fails.
+        """
+        if not documents:
+            return []
+        
+        settings = self._embedding_settings or EmbeddingSettings()
+        try:
+            vectors = embed_documents_batched(
+                self.embeddings,
+                [doc.page_content for doc in documents],
+                settings.embedding_batch_size,
+                embed_concurrency(settings),
+            )
+        except Exception as e:
+            raise VectorStoreError(f"Failed to add documents: {e}")
+        
+        matrix = l2_normalize(np.ascontiguousarray(vectors, dtype=np.float32))
+        
+        # Like ChromaStore's upsert, an existing ID is replaced
+        replaced = [doc.id for doc in documents if doc.id]
+        if replaced:
+            self.delete(replaced)
+        
+        self._reserve(len(matrix), matrix.shape[1])
+        end = self._size + len(matrix)
+        self._mat[self._size:end] = matrix
+        if self.quantize:
+            self._codes[self._size:end] = quantize_unit(matrix)
+        self._size = end
+        
+        ids = [doc.id or str(uuid.uuid4()) for doc in documents]
+        self._ids.extend(ids)
+        self._docs.extend(
+            Document(
+                page_content=doc.page_content, metadata=dict(doc.metadata), id=doc_id
+            )
+            for doc, doc_id in zip(documents, ids)
+        )
+        return ids
+    
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[dict] = None,
+    ) -> List[Document]:
+        """Search for similar documents.
+        
+        Args:
+            query: Search query text.
+            k: Number of results to return.
+            filter: Optional metadata filter; documents must match every
+                key/value pair exactly.
+            
+        Returns:
+            List of similar documents, ordered by relevance.
+        """
+        results = self.similarity_search_with_score(query, k=k, filter=filter)
+        return [doc for doc, _ in results]
+    
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[dict] = None,
+    ) -> List[tuple[Document, float]]:
+        """Search for similar documents with cosine distances.
+        
+        Args:
+            query: Search query text.
+            k: Number of results to return.
+            filter: Optional metadata filter; documents must match every
+                key/value pair exactly.
+            
+        Returns:
+            List of (document, score) tuples, ordered by relevance.
+        """
+        if not self._size or k <= 0:
+            return []
+        
+        q = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm:
+            q /= norm
+        if self.quantize:
+            scores = int8_dot_batch(self._codes[:self._size], quantize_unit(q))
+        else:
+            scores = self._mat[:self._size] @ q
+        
+        if filter:
+            matches = np.fromiter(
+                (all(doc.metadata.get(key) == value for key, value in filter.items())
+                 for doc in self._docs),
+                dtype=bool,
+                count=self._size,
+            )
+            scores[~matches] = -np.inf
+            k = min(k, int(matches.sum()))
+            if not k:
+                return []
+        
+        k = min(k, self._size)
+        n = min(RERANK_FACTOR * k, len(scores)) if self.quantize else k
+        nearest = np.argpartition(-scores, n - 1)[:n]
+        if self.quantize:
+            # Exact cosine for the shortlist; filtered-out rows stay -inf
+            scores[nearest] = np.where(
+                np.isneginf(scores[nearest]), -np.inf, self._mat[nearest] @ q
+            )
+        nearest = nearest[np.argsort(-scores[nearest])][:k]
+        return _copy_results([(self._docs[i], float(1.0 - scores[i])) for i in nearest])
+    
+    def delete(self, ids: List[str]) -> None:
+        """Delete documents by ID.
+        
+        Args:
+            ids: List of document IDs to delete.
+        """
+        drop = set(ids)
+        keep = [i for i, doc_id in enumerate(self._ids) if doc_id not in drop]
+        if len(keep) == self._size:
+            return
+        
+        self._mat[:len(keep)] = self._mat[keep]
+        if self.quantize:
+            self._codes[:len(keep)] = self._codes[keep]
+        self._size = len(keep)
+        self._ids = [self._ids[i] for i in keep]
+        self._docs = [self._docs[i] for i in keep]
     
     def count(self) -> int:
         """Get number of documents in store.
@@ -129,10 +822,12 @@ class ChromaStore:
         Returns:
             Document count.
         """
-        return len(self.store.get()["ids"])
+        return self._size
     
     def clear(self) -> None:
         """Remove all documents from store."""
-        all_ids = self.store.get()["ids"]
-        if all_ids:
-            self.store.delete(all_ids)
+        self._mat = np.empty((0, 0), dtype=np.float32)
+        self._codes = np.empty((0, 0), dtype=np.int8)
+        self._size = 0
+        self._ids = []
+        self._docs = []
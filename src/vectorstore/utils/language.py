@@ -1,37 +1,148 @@
 """Language detection utilities."""
 
-from typing import Optional
+import os
+import re
+from functools import lru_cache
+from typing import Callable, Optional
+
+# Leading characters used for detection; a longer text's language is
+# decided by its start, and bounded keys keep the result cache small
+DETECT_PREFIX_CHARS = 256
+
+# Languages detected; anything else is mapped to "en"
+DETECT_LANGUAGES = ("en", "de")
+
+# Below this lingua confidence, mixed-language text is decided by the
+# German-word heuristic instead
+LINGUA_MIN_CONFIDENCE = 0.8
+
+# Shorter texts are too ambiguous for a two-language detector ("OK")
+MIN_DETECT_CHARS = 3
+
+# Words for the fallback heuristic: one C-level scan that also drops
+# punctuation, so "das?" still counts as "das"
+_WORD_RE = re.compile(r"[A-Za-zÄÖÜäöüß]+")
+
+# Common German words counted by the fallback heuristic
+_GERMAN_INDICATORS: frozenset[str] = frozenset({
+    "der", "die", "das", "und", "ist", "sind", "ein", "eine",
+    "für", "mit", "auf", "nicht", "ich", "du", "wir", "sie",
+    "kann", "wird", "haben", "werden", "über", "nach",
+})
+
+
+@lru_cache(maxsize=1)
+def _get_detector() -> Optional[Callable[[str], Optional[str]]]:
+    """Build the best available detector once.
+    
+    Prefers lingua (Rust, microseconds per call), then langdetect; None if
+    neither is installed. Detectors return a language code, or None when
+    they are not confident enough to decide.
+    """
+    for build in (_build_lingua_detector, _build_langdetect_detector):
+        detect = build()
+        if detect is not None:
+            return detect
+    return None
+
+
+def _build_lingua_detector() -> Optional[Callable[[str], Optional[str]]]:
+    """Lingua detector restricted to English and German."""
+    try:
+        from lingua import Language, LanguageDetectorBuilder
+    except ImportError:
+        return None
+    
+    codes = {Language.ENGLISH: "en", Language.GERMAN: "de"}
+    detector = (
+        LanguageDetectorBuilder.from_languages(*codes)
+        .with_low_accuracy_mode()
+        .build()
+    )
+    
+    def detect(text: str) -> Optional[str]:
+        confidences = detector.compute_language_confidence_values(text)
+        if not confidences or confidences[0].value < LINGUA_MIN_CONFIDENCE:
+            return None
+        return codes[confidences[0].language]
+    
+    return detect
+
+
+def _build_langdetect_detector() -> Optional[Callable[[str], Optional[str]]]:
+    """langdetect detector with only the DETECT_LANGUAGES profiles.
+    
+    langdetect.detect would initialize all 55 profiles (~40 MB held for
+    the process lifetime). Seeded, so results are deterministic.
+    """
+    try:
+        from langdetect.detector_factory import PROFILES_DIRECTORY, DetectorFactory
+    except ImportError:
+        return None
+    
+    profiles = []
+    for lang in DETECT_LANGUAGES:
+        with open(os.path.join(PROFILES_DIRECTORY, lang), encoding="utf-8") as f:
+            profiles.append(f.read())
+    
+    factory = DetectorFactory()
+    factory.load_json_profile(profiles)
+    factory.seed = 0
+    
+    def detect(text: str) -> Optional[str]:
+        detector = factory.create()
+        detector.append(text)
+        language: str = detector.detect()
+        return language
+    
+    return detect
 
 
 def detect_language(text: str) -> str:
     """Detect the language of input text.
     
-    Uses langdetect library if available, falls back to simple heuristics.
+    Uses lingua or langdetect if available, falls back to simple heuristics.
+    Results are cached per normalized text prefix.
     
     Args:
         text: Input text to analyze.
-        
+    
     Returns:
         Language code ("en", "de", etc.). Defaults to "en".
     """
+    # Stripped so repeated messages ("hi", "danke ") hit the cache. Case is
+    # kept: langdetect's n-gram profiles are case-sensitive
+    return _detect_language_cached(text[:DETECT_PREFIX_CHARS].strip())
+
+
+@lru_cache(maxsize=4096)
+def _detect_language_cached(text: str) -> str:
+    """Detect the language of a normalized text prefix (memoized)."""
+    detect = _get_detector()
+    if detect is None:
+        return _detect_language_heuristic(text)
+    
+    if len(text) < MIN_DETECT_CHARS:
+        return "en"
+    
     try:
-        from langdetect import detect
         lang = detect(text)
-        # Map to supported languages
-        if lang == "de":
-            return "de"
-        return "en"
-    except ImportError:
-        # Fallback: simple German word detection
-        german_indicators = [
-            "der", "die", "das", "und", "ist", "sind", "ein", "eine",
-            "für", "mit", "auf", "nicht", "ich", "du", "wir", "sie",
-            "kann", "wird", "haben", "werden", "über", "nach"
-        ]
-        words = text.lower().split()
-        german_count = sum(1 for w in words if w in german_indicators)
-        if german_count >= 2 or (len(words) > 0 and german_count / len(words) > 0.2):
-            return "de"
-        return "en"
     except Exception:
         return "en"
+    
+    if lang is None:
+        return _detect_language_heuristic(text)
+    
+    # Map to supported languages
+    if lang == "de":
+        return "de"
+    return "en"
+
+
+def _detect_language_heuristic(text: str) -> str:
+    """Fallback: simple German word detection."""
+    words = _WORD_RE.findall(text.lower())
+    german_count = sum(1 for w in words if w in _GERMAN_INDICATORS)
+    if german_count >= 2 or (len(words) > 0 and german_count / len(words) > 0.2):
+        return "de"
+    return "en"
@@ -14,6 +14,7 @@ from src.evaluation import (
     calculate_relevance_score,
     evaluate_response,
     load_test_questions,
+    run_evaluation,
 )
 
 
@@ -27,9 +28,9 @@ def sample_documents():
     ]
 
 
-@pytest.fixture
-def test_questions_file(tmp_path):
-    """Create a temporary test questions file."""
+@pytest.fixture(scope="session")
+def test_questions_file(tmp_path_factory):
+    """Create a temporary test questions file, once per session."""
     questions = {
         "description": "Test questions",
         "questions": [
@@ -37,7 +38,7 @@ def test_questions_file(tmp_path):
             {"id": "q2", "question": "What do dogs need?", "expected_keywords": ["exercise"]},
         ]
     }
-    file_path = tmp_path / "test_questions.json"
+    file_path = tmp_path_factory.mktemp("eval") / "test_questions.json"
     file_path.write_text(json.dumps(questions))
     return file_path
 
@@ -62,6 +63,14 @@ class TestCalculateRelevanceScore:
         )
         assert score == 0.5  # Only "cats" found
 
+    def test_relevance_with_overlapping_keywords(self, sample_documents):
+        score = calculate_relevance_score(
+            question="What about cats?",
+            retrieved_docs=sample_documents,
+            expected_keywords=["Cat", "cats", "pets"],
+        )
+        assert score == 1.0  # Overlapping keywords each count
+
     def test_relevance_with_no_keywords(self, sample_documents):
         score = calculate_relevance_score(
             question="Test question",
@@ -92,6 +101,11 @@ class TestCalculateFaithfulnessScore:
         score = calculate_faithfulness_score(answer, sample_documents)
         assert score < 0.5  # Few words from sources
 
+    def test_faithfulness_matches_whole_words(self):
+        docs = [Document(page_content="Categories of care.", metadata={})]
+        score = calculate_faithfulness_score("Cat care", docs)
+        assert score == 0.5  # "care" matches, "cat" is not a word in sources
+
     def test_faithfulness_with_empty_answer(self, sample_documents):
         score = calculate_faithfulness_score("", sample_documents)
         assert score == 0.0
@@ -152,6 +166,69 @@ class TestLoadTestQuestions:
         assert questions[0]["id"] == "q1"
         assert "expected_keywords" in questions[0]
 
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    def test_load_utf8_questions(self, tmp_path, orjson_available):
+        if orjson_available:
+            pytest.importorskip("orjson")
+        
+        file_path = tmp_path / "questions_de.json"
+        questions = {
+            "questions": [{"id": "q1", "question": "Wofür braucht man Übung?"}]
+        }
+        file_path.write_bytes(json.dumps(questions, ensure_ascii=False).encode("utf-8"))
+        
+        modules = {} if orjson_available else {"orjson": None}
+        with patch.dict("sys.modules", modules):
+            loaded = load_test_questions(file_path)
+        
+        assert loaded == questions["questions"]
+
+
+class TestRunEvaluation:
+    """Tests for the evaluation loop."""
+
+    @patch("src.evaluation.runner.RAGChain")
+    def test_run_evaluation_preserves_question_order(self, mock_chain_class):
+        mock_chain = MagicMock()
+        mock_chain.invoke.side_effect = lambda q: {
+            "answer": f"Answer to {q}",
+            "sources": [{"content": "Cats and dogs need exercise.", "metadata": {}}],
+        }
+        mock_chain_class.return_value = mock_chain
+        mock_tracker = MagicMock()
+        
+        questions = [
+            {"question": f"Question {i}?", "expected_keywords": ["exercise"]}
+            for i in range(5)
+        ]
+        
+        results = run_evaluation(MagicMock(), questions, tracker=mock_tracker)
+        
+        assert [r.question for r in results] == [q["question"] for q in questions]
+        assert all(r.answer == f"Answer to {r.question}" for r in results)
+        assert all(r.relevance_score == 1.0 for r in results)
+        steps = [c.kwargs["step"] for c in mock_tracker.log_evaluation.call_args_list]
+        assert steps == list(range(5))
+
+    @patch("src.evaluation.runner.RAGChain")
+    def test_run_evaluation_warms_store_before_queries(self, mock_chain_class):
+        store = MagicMock()
+        warmed_first = []
+        
+        def invoke(question):
+            warmed_first.append(store.warm.called)
+            return {"answer": "Answer", "sources": []}
+        
+        mock_chain_class.return_value.invoke.side_effect = invoke
+        
+        run_evaluation(store, [{"question": "Q1?"}, {"question": "Q2?"}])
+        
+        store.warm.assert_called_once()
+        assert warmed_first == [True, True]
+
+    def test_run_evaluation_empty_questions(self):
+        assert run_evaluation(MagicMock(), []) == []
+
 
 # Tracker Tests
 class TestExperimentTracker:
@@ -212,3 +289,137 @@ class TestExperimentTracker:
         tracker.log_evaluation(result, step=0)
         
         mock_mlflow.log_metrics.assert_called_once()
+        mock_client.log_batch.assert_not_called()
+
+    @patch("src.evaluation.tracker.mlflow")
+    @patch("src.evaluation.tracker.MlflowClient")
+    def test_end_run_flushes_buffered_metrics(self, mock_client_class, mock_mlflow):
+        mock_client = MagicMock()
+        mock_client.get_experiment_by_name.return_value = MagicMock(
+            experiment_id="exp-123"
+        )
+        mock_client_class.return_value = mock_client
+        
+        mock_run = MagicMock()
+        mock_run.info.run_id = "run-456"
+        mock_mlflow.start_run.return_value = mock_run
+        
+        tracker = ExperimentTracker()
+        tracker.start_run()
+        
+        result = EvaluationResult(
+            question="Test?",
+            answer="Answer",
+            expected_answer=None,
+            sources=[],
+            latency_seconds=0.5,
+            relevance_score=0.8,
+            faithfulness_score=0.9,
+        )
+        for step in range(3):
+            tracker.log_evaluation(result, step=step)
+        
+        tracker.end_run()
+        
+        mock_client.log_batch.assert_called_once()
+        kwargs = mock_client.log_batch.call_args.kwargs
+        assert kwargs["run_id"] == "run-456"
+        assert len(kwargs["metrics"]) == 12  # 4 metrics x 3 queries
+
+    @patch("src.evaluation.tracker.MAX_METRICS_PER_BATCH", 10)
+    @patch("src.evaluation.tracker.mlflow")
+    @patch("src.evaluation.tracker.MlflowClient")
+    def test_full_metric_batches_written_during_run(
+        self, mock_client_class, mock_mlflow
+    ):
+        mock_client = MagicMock()
+        mock_client.get_experiment_by_name.return_value = MagicMock(
+            experiment_id="exp-123"
+        )
+        mock_client_class.return_value = mock_client
+        mock_mlflow.start_run.return_value = MagicMock()
+        
+        tracker = ExperimentTracker()
+        tracker.start_run()
+        result = EvaluationResult(
+            question="Test?",
+            answer="Answer",
+            expected_answer=None,
+            sources=[],
+            latency_seconds=0.5,
+            relevance_score=0.8,
+            faithfulness_score=0.9,
+        )
+        for step in range(5):
+            tracker.log_evaluation(result, step=step)
+        
+        batches = [c.kwargs["metrics"] for c in mock_client.log_batch.call_args_list]
+        assert [len(b) for b in batches] == [10, 10]
+        
+        tracker.end_run()
+        
+        batches = [c.kwargs["metrics"] for c in mock_client.log_batch.call_args_list]
+        assert [len(b) for b in batches] == [10, 10]
+        assert [m.step for m in batches[0][:4]] == [0, 0, 0, 0]
+
+    @patch("src.evaluation.tracker.mlflow")
+    @patch("src.evaluation.tracker.MlflowClient")
+    def test_log_batch_results(self, mock_client_class, mock_mlflow):
+        mock_client = MagicMock()
+        mock_client.get_experiment_by_name.return_value = MagicMock(
+            experiment_id="exp-123"
+        )
+        mock_client_class.return_value = mock_client
+        
+        tracker = ExperimentTracker()
+        
+        results = [
+            EvaluationResult(
+                question="Q1?",
+                answer="A1",
+                expected_answer=None,
+                sources=[],
+                latency_seconds=1.0,
+                relevance_score=1.0,
+                faithfulness_score=0.5,
+            ),
+            EvaluationResult(
+                question="Q2?",
+                answer="A2",
+                expected_answer=None,
+                sources=[],
+                latency_seconds=3.0,
+                relevance_score=None,
+                faithfulness_score=0.5,
+            ),
+        ]
+        
+        tracker.log_batch_results(results)
+        
+        mock_mlflow.log_metrics.assert_called_once_with({
+            "avg_latency_seconds": 2.0,
+            "avg_relevance_score": 0.5,
+            "avg_faithfulness_score": 0.5,
+            "total_queries": 2,
+        })
+
+    @patch("src.evaluation.tracker.mlflow")
+    @patch("src.evaluation.tracker.MlflowClient")
+    def test_log_dict_artifact_writes_json(self, mock_client_class, mock_mlflow):
+        mock_client = MagicMock()
+        mock_client.get_experiment_by_name.return_value = MagicMock(
+            experiment_id="exp-123"
+        )
+        mock_client_class.return_value = mock_client
+        
+        logged = {}
+        mock_mlflow.log_artifact.side_effect = (
+            lambda path, artifact_path: logged.update(
+                json.loads(Path(path).read_text())
+            )
+        )
+        
+        tracker = ExperimentTracker()
+        tracker.log_dict_artifact({"results": [{"score": 0.5}]}, "results.json")
+        
+        assert logged == {"results": [{"score": 0.5}]}
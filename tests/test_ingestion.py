@@ -1,6 +1,7 @@
 """Tests for document ingestion module."""
 
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from langchain_core.documents import Document
@@ -10,27 +11,31 @@ from src.ingestion import (
     DocumentLoaderError,
     chunk_documents,
     chunk_text,
+    iter_chunks,
+    lazy_load_pdf,
     load_directory,
     load_document,
     load_markdown,
     load_text,
 )
+from src.ingestion.chunking import create_text_splitter
+from src.ingestion.io_uring_loader import batch_read_texts
 
 
 # Fixtures
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_docs_dir() -> Path:
     """Path to sample documents directory."""
     return Path(__file__).parent.parent / "data" / "sample_docs"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_text_file(sample_docs_dir) -> Path:
     """Path to sample text file."""
     return sample_docs_dir / "sample.txt"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_markdown_file(sample_docs_dir) -> Path:
     """Path to sample markdown file."""
     return sample_docs_dir / "sample.md"
@@ -78,6 +83,15 @@ class TestMarkdownLoader:
         assert docs[0].metadata["file_type"] == "markdown"
 
 
+class TestPdfLoader:
+    """Tests for PDF loading."""
+
+    def test_lazy_load_pdf_missing_file_raises(self, tmp_path):
+        pages = lazy_load_pdf(tmp_path / "missing.pdf")
+        with pytest.raises(DocumentLoaderError):
+            next(pages)
+
+
 class TestLoadDocument:
     """Tests for generic document loading."""
 
@@ -110,11 +124,77 @@ class TestLoadDirectory:
         assert len(docs) >= 1
         assert all(d.metadata["file_type"] == "text" for d in docs)
 
+    def test_load_directory_parallel_matches_serial(self, sample_docs_dir):
+        serial = load_directory(sample_docs_dir, max_workers=1)
+        with patch("src.ingestion.loaders.PARALLEL_MIN_BYTES", 0):
+            parallel = load_directory(sample_docs_dir, max_workers=2)
+        assert [d.page_content for d in parallel] == [d.page_content for d in serial]
+
+    def test_small_directories_load_in_process(self, tmp_path):
+        (tmp_path / "notes.txt").write_text("Readable text")
+        (tmp_path / "bad.pdf").write_bytes(b"not a pdf")
+        
+        with patch("src.ingestion.loaders.ProcessPoolExecutor") as pool:
+            docs = load_directory(tmp_path, max_workers=4)
+        
+        assert pool.call_count == 0
+        assert [d.page_content for d in docs] == ["Readable text"]
+
+    def test_load_directory_skips_failing_files(self, tmp_path):
+        (tmp_path / "good.txt").write_text("Readable text")
+        (tmp_path / "bad.pdf").write_bytes(b"not a pdf")
+        docs = load_directory(tmp_path, max_workers=2)
+        assert [d.page_content for d in docs] == ["Readable text"]
+
+    def test_load_directory_logs_failing_files(self, tmp_path, caplog):
+        (tmp_path / "bad.pdf").write_bytes(b"not a pdf")
+        with caplog.at_level("WARNING", logger="src.ingestion.loaders"):
+            load_directory(tmp_path, max_workers=1)
+        assert "bad.pdf" in caplog.text
+
+    def test_load_directory_text_only_matches_loaders(self, sample_docs_dir):
+        docs = load_directory(sample_docs_dir, extensions=[".txt", ".md"])
+        expected = {
+            str(p): load_document(p)[0]
+            for p in sample_docs_dir.iterdir()
+            if p.suffix in {".txt", ".md"}
+        }
+        assert len(docs) == len(expected)
+        for doc in docs:
+            assert doc.page_content == expected[doc.metadata["source"]].page_content
+            assert doc.metadata == expected[doc.metadata["source"]].metadata
+
+    def test_load_directory_single_pass_filters(self, tmp_path):
+        (tmp_path / "b.txt").write_text("Second")
+        (tmp_path / "A.TXT").write_text("First")
+        (tmp_path / "notes.csv").write_text("skip")
+        (tmp_path / "nested.txt").mkdir()
+        docs = load_directory(tmp_path, extensions=["TXT"], max_workers=1)
+        assert [d.page_content for d in docs] == ["First", "Second"]
+
     def test_load_directory_not_found(self):
         with pytest.raises(DocumentLoaderError, match="Directory not found"):
             load_directory(Path("/nonexistent/directory"))
 
 
+class TestBatchReadTexts:
+    """Tests for batched text file reads."""
+
+    def test_matches_text_mode_read(self, sample_docs_dir, tmp_path):
+        crlf_file = tmp_path / "crlf.txt"
+        crlf_file.write_bytes(b"line one\r\nline two\r\n")
+        paths = sorted(sample_docs_dir.glob("*.txt")) + [crlf_file]
+        
+        texts = batch_read_texts(paths)
+        
+        assert texts == [p.read_text(encoding="utf-8") for p in paths]
+        assert texts[-1] == "line one\nline two\n"
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(OSError):
+            batch_read_texts([tmp_path / "missing.txt"])
+
+
 # Chunking Tests
 class TestChunkingConfig:
     """Tests for chunking configuration."""
@@ -142,6 +222,46 @@ class TestChunkingConfig:
             ChunkingConfig(chunk_size=100, chunk_overlap=100)
 
 
+class TestFastRecursiveSplitter:
+    """Tests for the fast splitter path."""
+
+    @pytest.mark.parametrize(
+        "chunk_size,chunk_overlap", [(1000, 200), (50, 10), (20, 0)]
+    )
+    def test_matches_langchain_splitter(
+        self, sample_text_file, chunk_size, chunk_overlap
+    ):
+        text = sample_text_file.read_text() * 3
+        config = ChunkingConfig(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        
+        expected = create_text_splitter(config, fast=False).split_text(text)
+        actual = create_text_splitter(config, fast=True).split_text(text)
+        
+        assert actual == expected
+
+    @pytest.mark.parametrize("chunk_size,chunk_overlap", [(10, 3), (7, 6), (5, 0)])
+    def test_character_fallback_matches_langchain(self, chunk_size, chunk_overlap):
+        # No separator except "" applies, so text is cut into raw windows
+        text = "abcdefghij klmnopqrst" * 5
+        config = ChunkingConfig(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap, separators=["\n", ""]
+        )
+        
+        expected = create_text_splitter(config, fast=False).split_text(text)
+        actual = create_text_splitter(config, fast=True).split_text(text)
+        
+        assert actual == expected
+
+    @pytest.mark.parametrize("text", ["", "  \n ", " Short.\n\nTwo lines.\n", "x" * 49])
+    def test_short_text_matches_langchain(self, text):
+        config = ChunkingConfig(chunk_size=50, chunk_overlap=10)
+        
+        expected = create_text_splitter(config, fast=False).split_text(text)
+        actual = create_text_splitter(config, fast=True).split_text(text)
+        
+        assert actual == expected
+
+
 class TestChunkDocuments:
     """Tests for document chunking."""
 
@@ -165,6 +285,85 @@ class TestChunkDocuments:
         # Smaller chunks should produce more documents
         assert len(chunks) >= 1
 
+    def test_chunk_documents_parallel_matches_serial(self):
+        docs = [
+            Document(
+                page_content=f"Document {i}. " * 40, metadata={"source": f"{i}.txt"}
+            )
+            for i in range(8)
+        ]
+        config = ChunkingConfig(chunk_size=100, chunk_overlap=10)
+        
+        serial = chunk_documents(docs, config, max_workers=1)
+        with patch("src.ingestion.chunking.PARALLEL_MIN_CHARS", 0):
+            parallel = chunk_documents(docs, config, max_workers=2)
+        
+        assert [c.page_content for c in parallel] == [c.page_content for c in serial]
+        assert [c.metadata for c in parallel] == [c.metadata for c in serial]
+        indices = [c.metadata["chunk_index"] for c in parallel]
+        assert indices == list(range(len(parallel)))
+
+    def test_small_batches_split_in_process(self):
+        docs = [Document(page_content="Page text. " * 100) for _ in range(8)]
+        
+        with patch("src.ingestion.chunking.ProcessPoolExecutor") as pool:
+            chunk_documents(docs, max_workers=4)
+        
+        assert pool.call_count == 0
+
+    def test_iter_chunks_matches_chunk_documents(self):
+        docs = [
+            Document(
+                page_content=f"Document {i}. " * 40, metadata={"source": f"{i}.txt"}
+            )
+            for i in range(3)
+        ]
+        config = ChunkingConfig(chunk_size=100, chunk_overlap=10)
+        
+        lazy = iter_chunks(iter(docs), config)
+        assert not isinstance(lazy, list)
+        
+        lazy = list(lazy)
+        eager = chunk_documents(docs, config, max_workers=1)
+        assert [c.page_content for c in lazy] == [c.page_content for c in eager]
+        assert [c.metadata for c in lazy] == [c.metadata for c in eager]
+
+    def test_chunk_documents_drops_duplicate_chunks(self):
+        footer = "Confidential - do not distribute."
+        docs = [
+            Document(page_content=footer, metadata={"source": "a.pdf"}),
+            Document(page_content="Unique body text.", metadata={"source": "a.pdf"}),
+            Document(page_content=footer, metadata={"source": "b.pdf"}),
+            Document(page_content=footer, metadata={"source": "a.pdf"}),
+            Document(page_content=footer, metadata={"source": "c.pdf"}),
+            Document(page_content=footer, metadata={"source": "b.pdf"}),
+        ]
+        chunks = chunk_documents(docs, max_workers=1, dedup=True)
+        
+        assert [c.page_content for c in chunks] == [footer, "Unique body text."]
+        # A string rather than a list, which older Chroma releases reject
+        assert chunks[0].metadata["aliases"] == "b.pdf\nc.pdf"
+        assert "aliases" not in chunks[1].metadata
+        assert [c.metadata["chunk_index"] for c in chunks] == [0, 1]
+
+    def test_duplicate_chunks_kept_by_default(self):
+        footer = "Confidential - do not distribute."
+        docs = [
+            Document(page_content=footer, metadata={"source": "a.pdf"}),
+            Document(page_content=footer, metadata={"source": "b.pdf"}),
+        ]
+        
+        eager = chunk_documents(docs, max_workers=1)
+        lazy = []
+        for chunk in iter_chunks(iter(docs)):
+            # Yielded chunks are final: later duplicates never change them
+            lazy.append((chunk, dict(chunk.metadata)))
+        
+        assert [c.metadata["source"] for c in eager] == ["a.pdf", "b.pdf"]
+        assert [c.metadata for c, _ in lazy] == [m for _, m in lazy]
+        assert [m["source"] for _, m in lazy] == ["a.pdf", "b.pdf"]
+        assert all("aliases" not in c.metadata for c in eager)
+
 
 class TestChunkText:
     """Tests for raw text chunking."""
@@ -1,8 +1,17 @@
 """Tests for language detection utilities."""
 
+from unittest.mock import MagicMock, patch
+
 import pytest
 
-from src.vectorstore.utils.language import detect_language
+from src.vectorstore.utils.language import (
+    _detect_language_cached,
+    _detect_language_heuristic,
+    detect_language,
+)
+
+# Patch target for swapping in a fake langdetect detector
+_GET_DETECTOR = "src.vectorstore.utils.language._get_detector"
 
 
 class TestLanguageDetection:
@@ -25,3 +34,27 @@ class TestLanguageDetection:
     def test_mixed_language_detection(self):
         # German-heavy mixed text should detect as German
         assert detect_language("Das ist ein Test mit some English words") == "de"
+
+    def test_uses_detector_when_available(self):
+        _detect_language_cached.cache_clear()
+        with patch(_GET_DETECTOR, return_value=lambda text: "de"):
+            assert detect_language("Hello there") == "de"
+        with patch(_GET_DETECTOR, return_value=lambda text: "fr"):
+            assert detect_language("Bonjour") == "en"
+        # Undecided detectors defer to the German-word heuristic
+        with patch(_GET_DETECTOR, return_value=lambda text: None):
+            assert detect_language("Das ist mit some words") == "de"
+        _detect_language_cached.cache_clear()
+
+    def test_repeated_text_detected_once(self):
+        _detect_language_cached.cache_clear()
+        detector = MagicMock(return_value="de")
+        with patch(_GET_DETECTOR, return_value=detector):
+            assert detect_language("Danke schön") == "de"
+            assert detect_language("  Danke schön ") == "de"
+        assert detector.call_count == 1
+        _detect_language_cached.cache_clear()
+
+    def test_heuristic_ignores_punctuation(self):
+        assert _detect_language_heuristic("Hello, und? Also: nicht!") == "de"
+        assert _detect_language_heuristic("Hello, world! How are you?") == "en"
@@ -1,6 +1,6 @@
 """Tests for vector store module."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 from langchain_core.documents import Document
@@ -9,41 +9,105 @@ from src.vectorstore import (
     ChromaStore,
     EmbeddingProvider,
     EmbeddingSettings,
+    InMemoryStore,
+    QuantizedChromaStore,
     VectorStoreError,
+    embed_texts,
+    get_embeddings,
+    l2_normalize,
+    preload_embeddings,
 )
 
 
 # Fixtures
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_embeddings():
-    """Mock embedding function that returns fixed vectors."""
+    """Mock embedding function that returns fixed vectors (shared per module)."""
     mock = MagicMock()
-    mock.embed_documents.return_value = [[0.1, 0.2, 0.3]] * 10
+    mock.embed_documents.side_effect = lambda texts: [[0.1, 0.2, 0.3]] * len(texts)
     mock.embed_query.return_value = [0.1, 0.2, 0.3]
     return mock
 
 
+@pytest.fixture(scope="module")
+def mock_get_embeddings(mock_embeddings):
+    """Patch the store's get_embeddings once for the whole module."""
+    with patch(
+        "src.vectorstore.store.get_embeddings", return_value=mock_embeddings
+    ) as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def _reset_mocks(mock_embeddings, mock_get_embeddings):
+    """Clear recorded calls and restore the default embeddings per test."""
+    mock_embeddings.reset_mock()
+    mock_get_embeddings.reset_mock(return_value=True)
+    mock_get_embeddings.return_value = mock_embeddings
+
+
 @pytest.fixture
+def chroma_store(mock_get_embeddings):
+    """ChromaStore on one shared collection, emptied after each test."""
+    store = ChromaStore(collection_name="test_chroma_store")
+    yield store
+    store.clear()
+
+
+@pytest.fixture(scope="module")
+def populated_store(mock_get_embeddings, sample_documents):
+    """ChromaStore holding the sample documents, built once for read-only tests."""
+    store = ChromaStore(collection_name="test_populated_store")
+    store.add_documents(sample_documents)
+    yield store
+    store.clear()
+
+
+# Built once at import; tests only read them
+_SAMPLE_DOCS = (
+    Document(page_content="First document about cats", metadata={"source": "doc1.txt"}),
+    Document(
+        page_content="Second document about dogs", metadata={"source": "doc2.txt"}
+    ),
+    Document(
+        page_content="Third document about birds", metadata={"source": "doc3.txt"}
+    ),
+)
+
+
+@pytest.fixture(scope="module")
 def sample_documents():
-    """Sample documents for testing."""
-    return [
-        Document(page_content="First document about cats", metadata={"source": "doc1.txt"}),
-        Document(page_content="Second document about dogs", metadata={"source": "doc2.txt"}),
-        Document(page_content="Third document about birds", metadata={"source": "doc3.txt"}),
-    ]
+    """Sample documents for testing (shared tuple; not modified by tests)."""
+    return _SAMPLE_DOCS
+
+
+@pytest.fixture(scope="session")
+def letter_embeddings():
+    """Deterministic embeddings from letter frequencies (stateless, shared)."""
+    from langchain_core.embeddings import Embeddings
+    
+    class LetterEmbeddings(Embeddings):
+        def embed_documents(self, texts):
+            return [self.embed_query(text) for text in texts]
+        
+        def embed_query(self, text):
+            counts = [text.lower().count(c) for c in "abcdefghijklmnopqrstuvwxyz"]
+            norm = sum(c * c for c in counts) ** 0.5 or 1.0
+            return [c / norm for c in counts]
+    
+    return LetterEmbeddings()
 
 
 # Embedding Settings Tests
 class TestEmbeddingSettings:
     """Tests for embedding configuration."""
 
-    def test_default_provider(self):
-        settings = EmbeddingSettings()
-        assert settings.embedding_provider == EmbeddingProvider.OPENAI
-
-    def test_default_model(self):
-        settings = EmbeddingSettings()
-        assert settings.embedding_model == "text-embedding-ada-002"
+    @pytest.mark.parametrize("attr,expected", [
+        ("embedding_provider", EmbeddingProvider.OPENAI),
+        ("embedding_model", "text-embedding-ada-002"),
+    ])
+    def test_defaults(self, attr, expected):
+        assert getattr(EmbeddingSettings(), attr) == expected
 
     def test_custom_settings(self):
         settings = EmbeddingSettings(
@@ -63,115 +127,597 @@ class TestEmbeddingSettings:
 class TestChromaStore:
     """Tests for ChromaDB vector store."""
 
-    @patch("src.vectorstore.store.get_embeddings")
-    def test_init_creates_store(self, mock_get_embeddings, mock_embeddings):
-        mock_get_embeddings.return_value = mock_embeddings
-        
-        store = ChromaStore(collection_name="test")
+    def test_init_creates_store(self, chroma_store, mock_get_embeddings):
         # Access store property to trigger initialization
-        _ = store.store
+        _ = chroma_store.store
         
-        assert store.collection_name == "test"
-        mock_get_embeddings.assert_called_once()
+        assert chroma_store.collection_name == "test_chroma_store"
+        assert mock_get_embeddings.call_count == 1
 
-    @patch("src.vectorstore.store.get_embeddings")
-    def test_add_documents(self, mock_get_embeddings, mock_embeddings, sample_documents):
-        mock_get_embeddings.return_value = mock_embeddings
-        
-        store = ChromaStore(collection_name="test_add")
-        ids = store.add_documents(sample_documents)
+    def test_add_documents(self, chroma_store, sample_documents):
+        ids = chroma_store.add_documents(sample_documents)
         
         assert len(ids) == 3
-        assert store.count() == 3
+        assert chroma_store.count() == 3
 
-    @patch("src.vectorstore.store.get_embeddings")
-    def test_add_empty_documents(self, mock_get_embeddings, mock_embeddings):
-        mock_get_embeddings.return_value = mock_embeddings
+    def test_add_documents_single_write(
+        self, chroma_store, mock_embeddings, sample_documents
+    ):
+        documents = list(sample_documents) + [Document(page_content="No metadata")]
+        collection = chroma_store.store._collection
+        with patch.object(collection, "upsert", wraps=collection.upsert) as upsert:
+            ids = chroma_store.add_documents(documents)
         
-        store = ChromaStore(collection_name="test_empty")
-        ids = store.add_documents([])
+        assert upsert.call_count == 1
+        assert upsert.call_args.kwargs["ids"] == ids
+        assert mock_embeddings.embed_documents.call_count == 1
+        assert chroma_store.count() == 4
+
+    def test_readding_id_replaces_document(self, chroma_store):
+        chroma_store.add_documents([Document(page_content="Old text", id="doc-1")])
+        chroma_store.add_documents([Document(page_content="New text", id="doc-1")])
         
-        assert ids == []
+        stored = chroma_store.store._collection.get(ids=["doc-1"])
+        assert chroma_store.count() == 1
+        assert stored["documents"] == ["New text"]
 
-    @patch("src.vectorstore.store.get_embeddings")
-    def test_similarity_search(self, mock_get_embeddings, mock_embeddings, sample_documents):
-        mock_get_embeddings.return_value = mock_embeddings
+    @pytest.mark.parametrize("store_class", ["ChromaStore", "QuantizedChromaStore"])
+    async def test_aadd_documents(
+        self, mock_get_embeddings, letter_embeddings, sample_documents, store_class
+    ):
+        import src.vectorstore as vectorstore
         
-        store = ChromaStore(collection_name="test_search")
-        store.add_documents(sample_documents)
+        mock_get_embeddings.return_value = letter_embeddings
+        store_type = getattr(vectorstore, store_class)
+        store = store_type(collection_name=f"test_aadd_{store_class}")
         
-        results = store.similarity_search("cats", k=2)
+        ids = await store.aadd_documents(sample_documents)
         
-        assert len(results) <= 2
-        assert all(isinstance(doc, Document) for doc in results)
+        assert store.count() == 3
+        assert store.similarity_search("cats", k=1)[0].id == ids[0]
+        assert await store.aadd_documents([]) == []
 
-    @patch("src.vectorstore.store.get_embeddings")
-    def test_similarity_search_with_score(self, mock_get_embeddings, mock_embeddings, sample_documents):
-        mock_get_embeddings.return_value = mock_embeddings
+    def test_add_empty_documents(self, chroma_store):
+        ids = chroma_store.add_documents([])
         
-        store = ChromaStore(collection_name="test_search_score")
-        store.add_documents(sample_documents)
+        assert ids == []
+
+    def test_similarity_search(self, populated_store):
+        results = populated_store.similarity_search("cats", k=2)
         
-        results = store.similarity_search_with_score("dogs", k=2)
+        assert len(results) <= 2
+        assert all(isinstance(doc, Document) for doc in results)
+
+    def test_similarity_search_with_score(self, populated_store):
+        results = populated_store.similarity_search_with_score("dogs", k=2)
         
         assert len(results) <= 2
         assert all(isinstance(r, tuple) for r in results)
         assert all(isinstance(r[0], Document) for r in results)
         assert all(isinstance(r[1], float) for r in results)
 
-    @patch("src.vectorstore.store.get_embeddings")
-    def test_delete_documents(self, mock_get_embeddings, mock_embeddings, sample_documents):
-        mock_get_embeddings.return_value = mock_embeddings
+    def test_repeated_search_cached_until_write(
+        self, chroma_store, mock_embeddings, sample_documents
+    ):
+        chroma_store.cache_searches = True
+        chroma_store.add_documents(sample_documents[:2])
         
-        store = ChromaStore(collection_name="test_delete")
-        ids = store.add_documents(sample_documents)
+        first = chroma_store.similarity_search("cats", k=2)
+        assert chroma_store.similarity_search_with_score("cats", k=2)[0][0] == first[0]
+        assert mock_embeddings.embed_query.call_count == 1
         
-        assert store.count() == 3
+        chroma_store.add_documents(sample_documents[2:])
+        chroma_store.similarity_search("cats", k=2)
+        assert mock_embeddings.embed_query.call_count == 2
+
+    def test_cached_results_are_copies(self, chroma_store, sample_documents):
+        chroma_store.cache_searches = True
+        chroma_store.add_documents(sample_documents)
         
-        store.delete([ids[0]])
+        chroma_store.similarity_search("cats", k=1)[0].metadata["source"] = "changed"
+        
+        result = chroma_store.similarity_search("cats", k=1)[0]
+        assert result.metadata["source"] != "changed"
+
+    def test_searches_uncached_by_default(self, populated_store, mock_embeddings):
+        populated_store.similarity_search("cats", k=2)
+        populated_store.similarity_search("cats", k=2)
         
-        assert store.count() == 2
+        assert mock_embeddings.embed_query.call_count == 2
 
-    @patch("src.vectorstore.store.get_embeddings")
-    def test_clear_store(self, mock_get_embeddings, mock_embeddings, sample_documents):
+    def test_delete_documents(self, chroma_store, sample_documents):
+        ids = chroma_store.add_documents(sample_documents)
+        
+        assert chroma_store.count() == 3
+        
+        chroma_store.delete([ids[0]])
+        
+        assert chroma_store.count() == 2
+
+    def test_clear_store(self, chroma_store, sample_documents):
+        chroma_store.add_documents(sample_documents)
+        
+        assert chroma_store.count() == 3
+        
+        chroma_store.clear()
+        
+        assert chroma_store.count() == 0
+
+    def test_count_empty_store(self, chroma_store):
+        assert chroma_store.count() == 0
+
+
+class TestEmbedTexts:
+    """Tests for batched text embedding."""
+
+    @patch("src.vectorstore.embeddings.get_embeddings")
+    def test_small_input_single_request(self, mock_get_embeddings, mock_embeddings):
         mock_get_embeddings.return_value = mock_embeddings
         
-        store = ChromaStore(collection_name="test_clear")
-        store.add_documents(sample_documents)
+        embed_texts(["a", "b"], batch_size=10)
         
-        assert store.count() == 3
+        assert mock_embeddings.embed_documents.call_args_list == [call(["a", "b"])]
+
+    @patch("src.vectorstore.embeddings.get_embeddings")
+    def test_large_input_batched_in_order(self, mock_get_embeddings):
+        mock = MagicMock()
+        batches = []
         
-        store.clear()
+        def embed_documents(batch):
+            batches.append(batch)
+            return [[float(text)] for text in batch]
         
-        assert store.count() == 0
+        mock.embed_documents.side_effect = embed_documents
+        mock_get_embeddings.return_value = mock
+        texts = [str(i) for i in range(25)]
+        
+        vectors = embed_texts(texts, batch_size=10)
+        
+        assert vectors == [[float(i)] for i in range(25)]
+        assert sorted(len(b) for b in batches) == [5, 10, 10]
+        # The shared client's async API is never driven from a throwaway loop
+        assert mock.aembed_documents.call_count == 0
 
-    @patch("src.vectorstore.store.get_embeddings")
-    def test_count_empty_store(self, mock_get_embeddings, mock_embeddings):
+    @patch("src.vectorstore.embeddings.get_embeddings")
+    def test_huggingface_batches_not_concurrent(
+        self, mock_get_embeddings, mock_embeddings
+    ):
         mock_get_embeddings.return_value = mock_embeddings
+        settings = EmbeddingSettings(
+            embedding_provider=EmbeddingProvider.HUGGINGFACE, embedding_batch_size=3
+        )
         
-        store = ChromaStore(collection_name="test_count_empty")
+        embed_texts(["x"] * 7, settings=settings)
         
-        assert store.count() == 0
+        assert mock_embeddings.embed_documents.call_args_list == [call(["x"] * 7)]
+
+    @patch("src.vectorstore.embeddings.get_embeddings")
+    def test_batch_size_from_settings(self, mock_get_embeddings):
+        mock = MagicMock()
+        batches = []
+        
+        def embed_documents(batch):
+            batches.append(batch)
+            return [[0.0]] * len(batch)
+        
+        mock.embed_documents.side_effect = embed_documents
+        mock_get_embeddings.return_value = mock
+        
+        embed_texts(["x"] * 7, settings=EmbeddingSettings(embedding_batch_size=3))
+        
+        assert sorted(len(b) for b in batches) == [1, 3, 3]
+
+
+class TestEmbeddings:
+    """Tests for embedding model loading and normalization."""
+
+    def test_get_embeddings_reuses_instance(self):
+        settings = EmbeddingSettings(openai_api_key="test-key")
+        
+        first = get_embeddings(settings)
+        assert get_embeddings(settings.model_copy()) is first
+        
+        get_embeddings.cache_clear()
+        assert get_embeddings(settings) is not first
+
+    def test_preload_blocks_get_embeddings_until_loaded(self):
+        import threading
+        
+        settings = EmbeddingSettings(embedding_provider=EmbeddingProvider.HUGGINGFACE)
+        release = threading.Event()
+        events = []
+        
+        def load(provider, model_name):
+            events.append("load")
+            if len(events) == 1:
+                release.wait(timeout=5)
+                events.append("loaded")
+            return "model"
+        
+        with patch("src.vectorstore.embeddings._load_embeddings", side_effect=load):
+            thread = preload_embeddings(settings)
+            threading.Timer(0.05, release.set).start()
+            assert get_embeddings(settings) == "model"
+            thread.join()
+        
+        assert events == ["load", "loaded", "load"]
+        assert preload_embeddings(EmbeddingSettings()) is None
+
+    def test_hf_uses_fp16_on_cuda(self):
+        from src.vectorstore.embeddings import _hf_model_kwargs
+        
+        torch = MagicMock()
+        torch.cuda.is_available.return_value = True
+        with patch.dict("sys.modules", {"torch": torch}):
+            assert _hf_model_kwargs() == {
+                "device": "cuda",
+                "model_kwargs": {"torch_dtype": torch.float16},
+            }
+        
+        torch.cuda.is_available.return_value = False
+        with patch.dict("sys.modules", {"torch": torch}):
+            assert _hf_model_kwargs() == {"device": "cpu"}
+
+    @pytest.mark.parametrize("numba_available", [True, False])
+    def test_l2_normalize_in_place(self, numba_available):
+        import numpy as np
+        
+        if numba_available:
+            pytest.importorskip("numba")
+        
+        vectors = np.array([[3.0, 4.0], [0.0, 0.0], [1.0, 0.0]], dtype=np.float32)
+        if numba_available:
+            result = l2_normalize(vectors)
+        else:
+            with patch(
+                "src.vectorstore.embeddings._get_normalize_kernel", return_value=None
+            ):
+                result = l2_normalize(vectors)
+        
+        assert result is vectors
+        np.testing.assert_allclose(
+            vectors, [[0.6, 0.8], [0.0, 0.0], [1.0, 0.0]], rtol=1e-6
+        )
+
+    def test_import_defers_provider_packages(self):
+        import subprocess
+        import sys
+        
+        code = (
+            "import sys, src.vectorstore; "
+            "print([m for m in ('langchain_chroma', 'langchain_openai') "
+            "if m in sys.modules])"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "[]"
 
 
 # Integration test (requires API key, skip in CI)
+# Key presence is read from the environment/.env once, at import
+_HAS_OPENAI_KEY = bool(EmbeddingSettings().openai_api_key)
+
+
 class TestEmbeddingsIntegration:
     """Integration tests for embeddings (require API key)."""
 
-    @pytest.mark.skipif(
-        not EmbeddingSettings().openai_api_key,
-        reason="OPENAI_API_KEY not set"
-    )
+    @pytest.mark.integration
+    @pytest.mark.skipif(not _HAS_OPENAI_KEY, reason="OPENAI_API_KEY not set")
     def test_get_embeddings_returns_model(self):
-        from src.vectorstore import get_embeddings
-        
         embeddings = get_embeddings()
         assert embeddings is not None
 
     def test_get_embeddings_raises_without_key(self):
-        from src.vectorstore import get_embeddings
-        
         settings = EmbeddingSettings(openai_api_key="")
         
         with pytest.raises(ValueError, match="OPENAI_API_KEY not set"):
             get_embeddings(settings)
+
+
+class TestQuantizedChromaStore:
+    """Tests for the quantized-index stores."""
+
+    # Letter embeddings have 26 dimensions, split into 2 PQ subspaces
+    QUANTIZATIONS = [
+        {"quantization": "int8"},
+        {"quantization": "pq", "pq_subspaces": 2},
+    ]
+
+    @pytest.mark.parametrize("options", QUANTIZATIONS)
+    def test_search_matches_chroma(
+        self, mock_get_embeddings, letter_embeddings, sample_documents, options
+    ):
+        mock_get_embeddings.return_value = letter_embeddings
+        name = options["quantization"]
+        plain = ChromaStore(collection_name=f"test_plain_ranking_{name}")
+        quantized = QuantizedChromaStore(
+            collection_name=f"test_quantized_ranking_{name}", **options
+        )
+        plain.add_documents(sample_documents)
+        quantized.add_documents(sample_documents)
+        
+        for query in ("cats", "dogs", "birds"):
+            expected = plain.similarity_search_with_score(query, k=2)
+            actual = quantized.similarity_search_with_score(query, k=2)
+            contents = [d.page_content for d, _ in expected]
+            assert [d.page_content for d, _ in actual] == contents
+            scores = [s for _, s in expected]
+            assert [s for _, s in actual] == pytest.approx(scores, abs=1e-5)
+
+    @pytest.mark.parametrize("options", QUANTIZATIONS)
+    def test_recall_after_one_document_per_add(
+        self, mock_get_embeddings, letter_embeddings, options
+    ):
+        import random
+        import string
+        
+        mock_get_embeddings.return_value = letter_embeddings
+        rng = random.Random(0)
+        texts = ["".join(rng.choices(string.ascii_lowercase, k=30)) for _ in range(100)]
+        name = options["quantization"]
+        plain = ChromaStore(collection_name=f"test_plain_one_by_one_{name}")
+        quantized = QuantizedChromaStore(
+            collection_name=f"test_quantized_one_by_one_{name}", **options
+        )
+        plain.add_documents([Document(page_content=text) for text in texts])
+        # Few enough centroids that PQ trains, and refits, partway through
+        with patch("src.vectorstore.quantization.PQ_CENTROIDS", 16):
+            for text in texts:
+                quantized.add_documents([Document(page_content=text)])
+        
+        hits = 0
+        for query in (text[:10] for text in texts[:10]):
+            expected = {d.page_content for d in plain.similarity_search(query, k=4)}
+            actual = {d.page_content for d in quantized.similarity_search(query, k=4)}
+            hits += len(expected & actual)
+        assert hits >= 38
+
+    @pytest.mark.parametrize("options", QUANTIZATIONS)
+    def test_concurrent_searches_during_writes(
+        self, mock_get_embeddings, letter_embeddings, options
+    ):
+        import random
+        import string
+        from concurrent.futures import ThreadPoolExecutor
+        
+        mock_get_embeddings.return_value = letter_embeddings
+        rng = random.Random(1)
+        texts = ["".join(rng.choices(string.ascii_lowercase, k=30)) for _ in range(60)]
+        name = options["quantization"]
+        store = QuantizedChromaStore(
+            collection_name=f"test_q_concurrent_{name}", cache_searches=True, **options
+        )
+        store.add_documents([Document(page_content=text) for text in texts[:20]])
+        store.warm()
+        
+        def search(i):
+            return store.similarity_search(texts[i % 20][:10], k=3)
+        
+        # Few enough centroids that writes retrain PQ while searches run
+        with patch("src.vectorstore.quantization.PQ_CENTROIDS", 16):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                searches = [pool.submit(search, i) for i in range(200)]
+                for text in texts[20:]:
+                    store.add_documents([Document(page_content=text)])
+                results = [future.result() for future in searches]
+        
+        assert all(len(found) == 3 for found in results)
+        assert len(store._index) == store.count() == 60
+        # Nothing cached before the last write is served after it
+        assert store.similarity_search(texts[59], k=1)[0].page_content == texts[59]
+
+    @pytest.mark.parametrize("options", QUANTIZATIONS)
+    def test_readding_id_replaces_indexed_vector(
+        self, mock_get_embeddings, letter_embeddings, options
+    ):
+        mock_get_embeddings.return_value = letter_embeddings
+        store = QuantizedChromaStore(
+            collection_name=f"test_q_upsert_{options['quantization']}", **options
+        )
+        store.add_documents([Document(page_content="cats cats", id="doc-1")])
+        store.add_documents([Document(page_content="dogs dogs", id="doc-1")])
+        
+        assert store._index.ids == ["doc-1"]
+        assert store.similarity_search("dogs", k=1)[0].page_content == "dogs dogs"
+
+    @pytest.mark.parametrize("options", QUANTIZATIONS)
+    def test_index_persists_and_tracks_deletes(
+        self,
+        mock_get_embeddings,
+        letter_embeddings,
+        sample_documents,
+        tmp_path,
+        options,
+    ):
+        mock_get_embeddings.return_value = letter_embeddings
+        store = QuantizedChromaStore(
+            collection_name="test_q_persist", persist_directory=tmp_path, **options
+        )
+        ids = store.add_documents(sample_documents)
+        store.delete([ids[0]])
+        store.flush()
+        
+        reopened = QuantizedChromaStore(
+            collection_name="test_q_persist", persist_directory=tmp_path, **options
+        )
+        
+        assert sorted(reopened._index.ids) == sorted(ids[1:])
+        results = reopened.similarity_search("cats", k=3)
+        assert "First document about cats" not in [d.page_content for d in results]
+
+    @pytest.mark.parametrize("options", QUANTIZATIONS)
+    def test_index_saved_lazily(
+        self,
+        mock_get_embeddings,
+        letter_embeddings,
+        sample_documents,
+        tmp_path,
+        options,
+    ):
+        mock_get_embeddings.return_value = letter_embeddings
+        store = QuantizedChromaStore(
+            collection_name="test_q_lazy_save", persist_directory=tmp_path, **options
+        )
+        with patch.object(type(store._index), "save") as save:
+            for doc in sample_documents:
+                store.add_documents([doc])
+        assert save.call_count == 0
+        assert not list(tmp_path.glob("*.npz"))
+        
+        # Unflushed: the reopened store rebuilds its index from Chroma
+        reopened = QuantizedChromaStore(
+            collection_name="test_q_lazy_save", persist_directory=tmp_path, **options
+        )
+        assert not len(reopened._index)
+        assert reopened.similarity_search("cats", k=1)[0].page_content == (
+            "First document about cats"
+        )
+        assert len(reopened._index) == 3
+
+    @pytest.mark.parametrize("options", QUANTIZATIONS)
+    def test_rebuild_reads_chroma_in_pages(
+        self, mock_get_embeddings, letter_embeddings, sample_documents, options
+    ):
+        mock_get_embeddings.return_value = letter_embeddings
+        name = options["quantization"]
+        store = QuantizedChromaStore(collection_name=f"test_q_paged_{name}", **options)
+        store.add_documents(sample_documents)
+        collection = store.store._collection
+        
+        with patch("src.vectorstore.store.INDEX_REBUILD_PAGE_ROWS", 2):
+            with patch.object(collection, "get", wraps=collection.get) as get:
+                store._rebuild_index()
+        
+        assert [c.kwargs["limit"] for c in get.call_args_list] == [2, 2]
+        assert sorted(store._index.ids) == sorted(collection.get(include=[])["ids"])
+
+    def test_pq_index_recall_and_roundtrip(self, tmp_path):
+        import numpy as np
+        
+        from src.vectorstore.quantization import PQIndex
+        
+        rng = np.random.default_rng(1)
+        vectors = rng.standard_normal((2000, 32)).astype(np.float32)
+        ids = [str(i) for i in range(len(vectors))]
+        index = PQIndex(subspaces=8)
+        index.add(ids, vectors)
+        
+        assert index.codes.shape == (2000, 8)
+        queries = vectors[:50] + 0.05 * rng.standard_normal((50, 32)).astype(np.float32)
+        hits = sum(str(i) in index.search(query, 10) for i, query in enumerate(queries))
+        assert hits >= 45
+        
+        index.save(tmp_path / "pq.npz")
+        loaded = PQIndex.load(tmp_path / "pq.npz")
+        assert loaded.subspaces == 8
+        assert loaded.search(queries[0], 10) == index.search(queries[0], 10)
+        
+        with pytest.raises(ValueError, match="not divisible"):
+            PQIndex(subspaces=5).fit(vectors)
+
+    def test_pq_index_scans_exactly_until_trained(self, tmp_path):
+        import numpy as np
+        
+        from src.vectorstore.quantization import PQIndex
+        
+        rng = np.random.default_rng(2)
+        vectors = rng.standard_normal((8, 4)).astype(np.float32)
+        index = PQIndex(subspaces=2)
+        with patch("src.vectorstore.quantization.PQ_CENTROIDS", 8):
+            for i, vector in enumerate(vectors[:7]):
+                index.add([str(i)], vector[np.newaxis])
+            
+            assert index.codebooks is None
+            assert index.search(vectors[3], 1) == ["3"]
+            index.save(tmp_path / "pq.npz")
+            loaded = PQIndex.load(tmp_path / "pq.npz")
+            assert loaded.search(vectors[3], 7) == index.search(vectors[3], 7)
+            
+            loaded.add(["7"], vectors[7:])
+        
+        assert loaded.codebooks.shape == (2, 8, 2)
+        assert loaded.pending is None
+        assert loaded.fit_size == 8
+        assert loaded.codes.shape == (8, 2)
+
+
+class TestInMemoryStore:
+    """Tests for the NumPy in-memory store."""
+
+    @pytest.mark.parametrize("quantize", [False, True])
+    def test_search_matches_chroma(
+        self, mock_get_embeddings, letter_embeddings, sample_documents, quantize
+    ):
+        mock_get_embeddings.return_value = letter_embeddings
+        plain = ChromaStore(collection_name=f"test_plain_inmemory_{quantize}")
+        store = InMemoryStore(quantize=quantize)
+        plain.add_documents(sample_documents)
+        store.add_documents(sample_documents)
+        
+        for query in ("cats", "dogs", "birds"):
+            expected = plain.similarity_search(query, k=2)
+            actual = store.similarity_search(query, k=2)
+            contents = [d.page_content for d in expected]
+            assert [d.page_content for d in actual] == contents
+
+    @pytest.mark.parametrize("quantize", [False, True])
+    def test_grows_deletes_and_filters(
+        self, mock_get_embeddings, letter_embeddings, quantize
+    ):
+        mock_get_embeddings.return_value = letter_embeddings
+        store = InMemoryStore(initial_capacity=2, quantize=quantize)
+        documents = [
+            Document(
+                page_content=f"document {i} " + "ab" * i,
+                metadata={"source": f"doc{i % 2}.txt"},
+            )
+            for i in range(5)
+        ]
+        ids = store.add_documents(documents[:1]) + store.add_documents(documents[1:])
+        
+        assert store.count() == 5
+        assert len(store._mat) == 8
+        
+        store.delete([ids[4]])
+        
+        results = store.similarity_search_with_score("ab" * 4, k=5)
+        assert [doc.id for doc, _ in results][0] == ids[3]
+        assert ids[4] not in [doc.id for doc, _ in results]
+        assert [s for _, s in results] == sorted(s for _, s in results)
+        
+        filtered = store.similarity_search("ab", k=5, filter={"source": "doc0.txt"})
+        assert sorted(doc.id for doc in filtered) == sorted([ids[0], ids[2]])
+        
+        filtered[0].metadata["source"] = "changed"
+        assert store.similarity_search("ab", k=5, filter={"source": "changed"}) == []
+        
+        store.clear()
+        assert store.count() == 0
+        assert store.similarity_search("ab") == []
+
+    @pytest.mark.parametrize("quantize", [False, True])
+    def test_readding_id_replaces_document(
+        self, mock_get_embeddings, letter_embeddings, quantize
+    ):
+        mock_get_embeddings.return_value = letter_embeddings
+        store = InMemoryStore(quantize=quantize)
+        store.add_documents([Document(page_content="cats cats", id="doc-1")])
+        store.add_documents([Document(page_content="dogs dogs", id="doc-1")])
+        
+        assert store.count() == 1
+        assert store.similarity_search("dogs", k=1)[0].page_content == "dogs dogs"
+
+    def test_int8_dot_batch_fallback_matches_integer_dot(self):
+        import numpy as np
+
+        from src.vectorstore.quantization import int8_dot_batch
+
+        rng = np.random.default_rng(0)
+        codes = rng.integers(-127, 128, size=(50, 64)).astype(np.int8)
+        query = rng.integers(-127, 128, size=64).astype(np.int8)
+        expected = codes.astype(np.int64) @ query.astype(np.int64)
+
+        with patch.dict("sys.modules", {"simsimd": None}):
+            np.testing.assert_array_equal(int8_dot_batch(codes, query), expected)
+        np.testing.assert_array_equal(int8_dot_batch(codes, query), expected)